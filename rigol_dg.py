@@ -8,10 +8,103 @@ import pyvisa as visa
 import numpy as np
 import logging
 import time
+from collections import deque, namedtuple
 from datetime import datetime
 
+# Maximum number of debug log entries kept in memory (oldest are dropped)
+_DEBUG_LOG_MAX = 5000
+
+# Maximum time to wait for a resource to open (ms)
+_OPEN_TIMEOUT_MS = 2000
+
+# Read chunk size for USB/serial sessions; large reads finish in one call
+_CHUNK_SIZE = 1024 * 1024
+
+# Multiplier from frequency unit name to Hz
+_FREQ_MULT = {'HZ': 1, 'KHZ': 1000, 'MHZ': 1000000}
+
+# Channel status returned by RigolDG.get_channel_state
+ChannelState = namedtuple("ChannelState", "func freq ampl ampl_unit output")
+
+
+def _to_dac16(data):
+    """
+    Convert normalized samples to DAC16 binary block payload
+
+    Args:
+        data: List or 1-D array of values between -1.0 and +1.0
+
+    Returns:
+        bytes: Little-endian 16-bit codes, 0x0000 (-1.0) to 0x3FFF (+1.0)
+    """
+    # Work on a float64 copy (bit-exact codes); the caller's array is left untouched
+    codes = np.array(data, dtype=np.float64)
+    codes += 1.0
+    codes *= 8191.5
+    np.clip(codes, 0, 16383, out=codes)
+    return codes.astype('<u2').tobytes()
+
+
+def _read_csv_samples(csv_file):
+    """
+    Read the last column of a CSV file as a float64 array
+
+    The separator is a semicolon if the first row contains one, a comma
+    otherwise. A non-numeric first row is treated as a header. Well-formed
+    files are parsed by np.loadtxt; files with blank cells, ragged or
+    invalid rows fall back to a row-by-row reader that skips bad rows.
+    """
+    with open(csv_file, 'r') as f:
+        first_row = f.readline()
+    delimiter = ';' if ';' in first_row else ','
+    try:
+        float(first_row.rsplit(delimiter, 1)[-1])
+        skip = 0
+    except ValueError:
+        skip = 1  # Header row
+
+    try:
+        return np.loadtxt(csv_file, delimiter=delimiter, skiprows=skip, ndmin=2)[:, -1]
+    except ValueError:
+        pass
+
+    import csv
+
+    data = []
+    with open(csv_file, 'r') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        for _ in range(skip):
+            next(reader, None)
+
+        for row in reader:
+            if len(row) == 0:
+                continue
+            try:
+                # Take the last column (assume it's the amplitude)
+                data.append(float(row[-1].strip()))
+            except ValueError:
+                continue  # Skip invalid rows
+
+    return np.array(data)
+
+
+def _dac16_command(channel, binary_data):
+    """
+    Build the complete DATA:DAC16 write for a DAC16 payload
+
+    The IEEE 488.2 definite-length block header (#<num_digits><num_bytes>)
+    and the terminator are joined with the payload in a single copy.
+    """
+    num_bytes_str = str(len(binary_data))
+    return b"".join((
+        f"SOUR{channel}:TRAC:DATA:DAC16 VOLATILE,END,#{len(num_bytes_str)}{num_bytes_str}".encode('ascii'),
+        binary_data,
+        b'\n',
+    ))
+
+
 class RigolDG:
-    def __init__(self, resource_name=None, debug=False):
+    def __init__(self, resource_name=None, debug=False, debug_callback=None, rm=None):
         """
         Initialize connection to Rigol DG800/DG900 generator
 
@@ -21,10 +114,18 @@ class RigolDG:
                           Ex: 'TCPIP0::192.168.1.100::INSTR'
                           If None, shows list of available devices
             debug: Enable debug logging (default: False)
+            debug_callback: Optional callable receiving each new debug log
+                           entry; may be called from any thread
+            rm: Optional shared pyvisa ResourceManager; it is left open by
+                close() so the caller can reuse it
         """
         # Debug mode
         self.debug = debug
-        self.debug_log = []
+        self.debug_log = deque(maxlen=_DEBUG_LOG_MAX)
+        self.debug_callback = debug_callback
+        # Total number of entries ever logged; never reset, so callers can
+        # cheaply tell whether anything new arrived
+        self.debug_seq = 0
 
         # Setup logging if debug enabled
         if self.debug:
@@ -33,7 +134,8 @@ class RigolDG:
             visa.log_to_screen()
 
         # Initialize VISA ResourceManager with PyVISA-py backend
-        self.rm = visa.ResourceManager('@py')
+        self._own_rm = rm is None
+        self.rm = visa.ResourceManager('@py') if rm is None else rm
 
         # If not specified, auto-detect devices
         if resource_name is None:
@@ -49,7 +151,7 @@ class RigolDG:
             resource_name = resources[idx]
 
         # Open connection with proper configuration
-        self.instr = self.rm.open_resource(resource_name)
+        self.instr = self.rm.open_resource(resource_name, open_timeout=_OPEN_TIMEOUT_MS)
         self.instr.timeout = 5000  # 5 seconds
 
         # Configure terminators for SCPI communication
@@ -65,13 +167,14 @@ class RigolDG:
                 self.instr.write_delay = 0
             except:
                 pass
+        else:
+            self.instr.chunk_size = _CHUNK_SIZE
 
         self._log_debug(f"Connected to {resource_name}")
         self._log_debug(f"Timeout: {self.instr.timeout} ms")
         self._log_debug(f"Read termination: {repr(self.instr.read_termination)}")
         self._log_debug(f"Write termination: {repr(self.instr.write_termination)}")
-        if 'TCPIP' in resource_name:
-            self._log_debug(f"Chunk size: {self.instr.chunk_size} bytes")
+        self._log_debug(f"Chunk size: {self.instr.chunk_size} bytes")
 
         # Try to identify the device
         try:
@@ -105,6 +208,11 @@ class RigolDG:
             timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
             log_entry = f"[{timestamp}] {message}"
             self.debug_log.append(log_entry)
+            if self.debug_callback is not None:
+                self.debug_callback(log_entry)
+            # Bumped last: once a reader sees the new value the entry is
+            # already in the log and has been passed to the callback
+            self.debug_seq += 1
             if is_error:
                 print(f"ERROR: {log_entry}")
             else:
@@ -138,8 +246,15 @@ class RigolDG:
             raise
 
     def get_debug_log(self):
-        """Return debug log as list of strings"""
-        return self.debug_log.copy()
+        """
+        Return debug log as list of strings
+
+        Use debug_seq to detect new entries, or debug_callback to receive
+        each entry as it is logged.
+        """
+        # A single list() copy: iterating the deque itself fails if another
+        # thread logs meanwhile
+        return list(self.debug_log)
 
     def clear_debug_log(self):
         """Clear debug log"""
@@ -221,14 +336,10 @@ class RigolDG:
             value: Numeric frequency value
             unit: Unit of measurement ('HZ', 'KHZ', 'MHZ')
         """
-        if unit.upper() == 'HZ':
-            freq_hz = value
-        elif unit.upper() == 'KHZ':
-            freq_hz = value * 1000
-        elif unit.upper() == 'MHZ':
-            freq_hz = value * 1000000
-        else:
+        mult = _FREQ_MULT.get(unit.upper())
+        if mult is None:
             raise ValueError(f"Unsupported unit: {unit}. Use 'HZ', 'KHZ', or 'MHZ'")
+        freq_hz = value * mult
 
         self._write(f"SOUR{channel}:FREQ {freq_hz}")
 
@@ -268,6 +379,18 @@ class RigolDG:
         """
         self._write(f"SOUR{channel}:VOLT:UNIT {unit}")
 
+    def set_amplitude_with_unit(self, channel, ampl, unit):
+        """
+        Sets unit and amplitude with a single compound SCPI command
+
+        Args:
+            channel: Channel number (1 or 2)
+            ampl: Amplitude value expressed in unit
+            unit: Unit of measurement ('VPP', 'VRMS', 'DBM')
+        """
+        # The unit is set first so the value is interpreted in it
+        self._write(f"SOUR{channel}:VOLT:UNIT {unit};:SOUR{channel}:VOLT {ampl}")
+
     def get_amplitude_unit(self, channel):
         """
         Gets the current unit of measurement for amplitude
@@ -351,8 +474,44 @@ class RigolDG:
         Args:
             channel: Channel number (1 or 2)
         """
-        self.set_output_load(channel, "50")
-        self.set_amplitude_unit(channel, "DBM")
+        self.configure_channel(channel, load="50", ampl_unit="DBM")
+
+    def configure_channel(self, channel, freq=None, ampl=None, ampl_unit=None,
+                          offset=None, phase=None, duty=None, load=None):
+        """
+        Sets several channel parameters with a single compound SCPI command
+
+        Parameters left to None are not changed. The load and amplitude unit
+        are applied first since they affect how the amplitude is interpreted.
+
+        Args:
+            channel: Channel number (1 or 2)
+            freq: Frequency in Hz
+            ampl: Amplitude, expressed in ampl_unit (or the current unit)
+            ampl_unit: Amplitude unit ('VPP', 'VRMS', 'DBM')
+            offset: Offset in Volts
+            phase: Phase in degrees
+            duty: Square wave duty cycle in %
+            load: Load impedance in Ohms or 'INF'
+        """
+        commands = []
+        if load is not None:
+            commands.append(f"OUTP{channel}:LOAD {load}")
+        if ampl_unit is not None:
+            commands.append(f"SOUR{channel}:VOLT:UNIT {ampl_unit}")
+        if freq is not None:
+            commands.append(f"SOUR{channel}:FREQ {freq}")
+        if ampl is not None:
+            commands.append(f"SOUR{channel}:VOLT {ampl}")
+        if offset is not None:
+            commands.append(f"SOUR{channel}:VOLT:OFFS {offset}")
+        if phase is not None:
+            commands.append(f"SOUR{channel}:PHAS {phase}")
+        if duty is not None:
+            commands.append(f"SOUR{channel}:FUNC:SQU:DCYC {duty}")
+
+        if commands:
+            self._write(";:".join(commands))
 
     # === QUERY (STATUS READING) ===
 
@@ -404,6 +563,23 @@ class RigolDG:
         """
         return self._query(f"OUTP{channel}?") == "ON"
 
+    def get_channel_state(self, channel):
+        """
+        Reads waveform, frequency, amplitude, unit and output state
+        with a single compound SCPI query
+
+        Args:
+            channel: Channel number (1 or 2)
+
+        Returns:
+            ChannelState: (func, freq, ampl, ampl_unit, output)
+        """
+        func, freq, ampl, unit, output = (
+            part.strip() for part in self._query(
+                f"SOUR{channel}:FUNC?;:SOUR{channel}:FREQ?;:SOUR{channel}:VOLT?;"
+                f":SOUR{channel}:VOLT:UNIT?;:OUTP{channel}?").split(";"))
+        return ChannelState(func, float(freq), float(ampl), unit, output == "ON")
+
     # === MODULATION ===
 
     def set_am_modulation(self, channel, depth, freq):
@@ -451,15 +627,13 @@ class RigolDG:
 
         Args:
             channel: Channel number (1 or 2)
-            data: List of normalized values between -1.0 and +1.0
+            data: List or NumPy array of normalized values between -1.0 and +1.0
                   Ex: [0, 0.5, 1.0, 0.5, 0, -0.5, -1.0, -0.5]
             name: Name to assign to the waveform (optional)
                   If None, loads directly into volatile memory
             use_binary: Use binary format for faster transfer (default: True)
                        Set to False to use ASCII/CSV format
         """
-        import struct
-
         data_size = len(data)
 
         # Save original timeout and increase it for large transfers
@@ -476,29 +650,19 @@ class RigolDG:
 
                 # Convert to 16-bit unsigned integers (0 to 16383 / 0x0000 to 0x3FFF)
                 # According to DG900 manual, DATA:DAC16 expects values from 0x0000 to 0x3FFF
-                data_array = np.array(data, dtype=np.float64)
-                # Scale from [-1.0, +1.0] to [0, 16383]
-                data_uint16 = np.clip((data_array + 1.0) * 8191.5, 0, 16383).astype(np.uint16)
-
-                # Convert to binary (little-endian, 2 bytes per point)
-                binary_data = data_uint16.tobytes()
-
-                # IEEE 488.2 binary block format: #<num_digits><num_bytes><data>
+                binary_data = _to_dac16(data)
                 num_bytes = len(binary_data)
-                num_bytes_str = str(num_bytes)
-                num_digits = len(num_bytes_str)
-                header = f"#{num_digits}{num_bytes_str}".encode('ascii')
 
                 # Build complete command - use DATA:DAC16 with END flag (manual section 2.6.2)
                 # When flag is END, the instrument automatically switches to arbitrary waveform output
-                cmd = f"SOUR{channel}:TRAC:DATA:DAC16 VOLATILE,END,".encode('ascii') + header + binary_data
+                cmd = _dac16_command(channel, binary_data)
 
                 self._log_debug(f"Binary transfer: {num_bytes} bytes ({data_size} points)")
                 self._log_debug(f"Sending to channel {channel} VOLATILE memory with END flag...")
                 self._log_debug(f"Data range: 0x0000 to 0x3FFF (0 to 16383)")
 
                 # Send binary data
-                self.instr.write_raw(cmd + b'\n')
+                self.instr.write_raw(cmd)
                 self._log_debug(f"Binary data sent successfully")
                 self._log_debug(f"Note: END flag automatically activates ARB waveform output")
 
@@ -526,26 +690,15 @@ class RigolDG:
                 self._log_debug(f"Converting to binary format...")
 
                 # Convert to 16-bit unsigned integers (0 to 16383 / 0x0000 to 0x3FFF)
-                data_array = np.array(data, dtype=np.float64)
-                # Scale from [-1.0, +1.0] to [0, 16383]
-                data_uint16 = np.clip((data_array + 1.0) * 8191.5, 0, 16383).astype(np.uint16)
-
-                # Convert to binary
-                binary_data = data_uint16.tobytes()
-
-                # IEEE 488.2 binary block format
-                num_bytes = len(binary_data)
-                num_bytes_str = str(num_bytes)
-                num_digits = len(num_bytes_str)
-                header = f"#{num_digits}{num_bytes_str}".encode('ascii')
+                binary_data = _to_dac16(data)
 
                 # Build complete command with END flag
-                cmd = f"SOUR{channel}:TRAC:DATA:DAC16 VOLATILE,END,".encode('ascii') + header + binary_data
+                cmd = _dac16_command(channel, binary_data)
 
                 self._log_debug(f"Sending {data_size} points to channel {channel}...")
 
                 # Send binary data
-                self.instr.write_raw(cmd + b'\n')
+                self.instr.write_raw(cmd)
                 self._log_debug(f"Binary data sent successfully")
                 time.sleep(0.3)
 
@@ -661,42 +814,30 @@ class RigolDG:
         - Separator can be comma or semicolon
         - Invalid rows are automatically ignored
         """
-        import csv
+        data = _read_csv_samples(csv_file)
 
-        data = []
+        if len(data) == 0:
+            raise ValueError("No valid data found in CSV file")
 
-        with open(csv_file, 'r') as f:
-            reader = csv.reader(f, delimiter=',')
+        return self.load_arb_from_array(channel, data, name, normalize)
 
-            # Try to detect and handle header
-            first_row = next(reader)
-            try:
-                # If first row is numeric, use it as data
-                if len(first_row) == 1:
-                    data.append(float(first_row[0]))
-                else:
-                    data.append(float(first_row[-1]))  # Take last column
-            except ValueError:
-                # First row is text header, ignore it
-                pass
-
-            # Read all remaining data
-            for row in reader:
-                if len(row) == 0:
-                    continue
-                try:
-                    # Take the last column (assume it's the amplitude)
-                    value = float(row[-1].strip())
-                    data.append(value)
-                except ValueError:
-                    continue  # Skip invalid rows
+    def load_arb_from_array(self, channel, data, name=None, normalize=True):
+        """
+        Loads an arbitrary waveform from a list or NumPy array
 
-        if not data:
-            raise ValueError("No valid data found in CSV file")
+        Args:
+            channel: Channel number (1 or 2)
+            data: Sample values (list or 1-D array)
+            name: Name to assign to the waveform (optional)
+            normalize: Scale values to the range -1..+1 (default: True)
+                      If False, values must already be between -1 and +1
 
+        Returns:
+            int: Number of points loaded
+        """
         # Normalize values between -1 and +1 if requested
         if normalize:
-            data_array = np.array(data)
+            data_array = np.asarray(data, dtype=np.float64)
             data_min = data_array.min()
             data_max = data_array.max()
 
@@ -707,7 +848,7 @@ class RigolDG:
                 # If all values are equal, set to zero
                 data_array = np.zeros_like(data_array)
 
-            data = data_array.tolist()
+            data = data_array
 
         # Load the waveform into the instrument
         self.create_arb_waveform(channel, data, name)
@@ -827,36 +968,32 @@ class RigolDG:
             pass
 
         self.instr.close()
-        self.rm.close()
+        if self._own_rm:
+            self.rm.close()
         self._log_debug("Connection closed")
 
 
 # === UTILITY FUNCTIONS ===
 
-def wav_to_csv(wav_file, csv_file, max_points=None, channel=0, normalize=True):
+def wav_to_array(wav_file, max_points=None, channel=0, normalize=True):
     """
-    Converts a WAV audio file to CSV format for arbitrary waveform generation
+    Reads a WAV audio file into a NumPy array for arbitrary waveform generation
 
     Args:
         wav_file: Path to input WAV file
-        csv_file: Path to output CSV file
-        max_points: Maximum number of points to export (None = use all)
+        max_points: Maximum number of points to return (None = use all)
                    Typical limits: 8k-16k depending on generator model
         channel: Audio channel to extract (0=left/mono, 1=right)
         normalize: Normalize values between -1 and +1 (default: True)
 
     Returns:
-        dict: Information about the conversion including:
-              - sample_rate: Original sample rate in Hz
-              - duration: Duration in seconds
-              - channels: Number of audio channels
-              - num_points: Number of points exported
-              - suggested_sample_rate: Recommended generator sample rate
+        tuple: (data, info) - data is a 1-D float array, info is the
+               same dictionary returned by wav_to_csv()
 
     Example:
-        >>> info = wav_to_csv("audio.wav", "waveform.csv", max_points=8192)
-        >>> print(f"Exported {info['num_points']} points")
-        >>> print(f"Suggested sample rate: {info['suggested_sample_rate']} Sa/s")
+        >>> data, info = wav_to_array("audio.wav", max_points=8192)
+        >>> gen.load_arb_from_array(1, data, name="AUDIO", normalize=False)
+        >>> gen.set_arb_sample_rate(1, info['suggested_sample_rate'])
     """
     import wave
     import struct
@@ -911,9 +1048,12 @@ def wav_to_csv(wav_file, csv_file, max_points=None, channel=0, normalize=True):
 
     # Downsample if max_points is specified
     if max_points and len(data) > max_points:
-        # Use linear interpolation for downsampling
-        indices = np.linspace(0, len(data) - 1, max_points)
-        data = np.interp(indices, np.arange(len(data)), data)
+        # Average consecutive blocks of samples (also a simple anti-alias
+        # filter). Block edges are spread over the whole file so no tail
+        # samples are dropped when the length is not an exact multiple.
+        n = len(data)
+        edges = np.linspace(0, n, max_points + 1).astype(np.intp)
+        data = np.add.reduceat(data, edges[:-1]) / np.diff(edges)
 
     # Normalize if requested
     if normalize:
@@ -921,16 +1061,12 @@ def wav_to_csv(wav_file, csv_file, max_points=None, channel=0, normalize=True):
         if data_max > 0:
             data = data / data_max
 
-    # Write to CSV file
-    np.savetxt(csv_file, data, fmt='%.6f', delimiter=',',
-               header='amplitude', comments='')
-
     # Calculate suggested sample rate for the generator
     duration = n_frames / sample_rate
     num_points = len(data)
     suggested_sample_rate = num_points / duration
 
-    return {
+    return data, {
         'sample_rate': sample_rate,
         'duration': duration,
         'channels': n_channels,
@@ -941,6 +1077,40 @@ def wav_to_csv(wav_file, csv_file, max_points=None, channel=0, normalize=True):
     }
 
 
+def wav_to_csv(wav_file, csv_file, max_points=None, channel=0, normalize=True):
+    """
+    Converts a WAV audio file to CSV format for arbitrary waveform generation
+
+    Args:
+        wav_file: Path to input WAV file
+        csv_file: Path to output CSV file
+        max_points: Maximum number of points to export (None = use all)
+                   Typical limits: 8k-16k depending on generator model
+        channel: Audio channel to extract (0=left/mono, 1=right)
+        normalize: Normalize values between -1 and +1 (default: True)
+
+    Returns:
+        dict: Information about the conversion including:
+              - sample_rate: Original sample rate in Hz
+              - duration: Duration in seconds
+              - channels: Number of audio channels
+              - num_points: Number of points exported
+              - suggested_sample_rate: Recommended generator sample rate
+
+    Example:
+        >>> info = wav_to_csv("audio.wav", "waveform.csv", max_points=8192)
+        >>> print(f"Exported {info['num_points']} points")
+        >>> print(f"Suggested sample rate: {info['suggested_sample_rate']} Sa/s")
+    """
+    data, info = wav_to_array(wav_file, max_points, channel, normalize)
+
+    # Write to CSV file
+    np.savetxt(csv_file, data, fmt='%.6f', delimiter=',',
+               header='amplitude', comments='')
+
+    return info
+
+
 # === USAGE EXAMPLE ===
 
 if __name__ == "__main__":
@@ -973,7 +1143,7 @@ if __name__ == "__main__":
         # Arbitrary waveform example: sinc
         # t = np.linspace(-np.pi, np.pi, 1000)
         # sinc_wave = np.sinc(t)
-        # gen.create_arb_waveform(1, sinc_wave.tolist(), "SINC")
+        # gen.create_arb_waveform(1, sinc_wave, "SINC")
         # gen.load_arb_waveform(1, "SINC")
 
         # CSV loading example
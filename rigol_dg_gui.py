@@ -6,20 +6,336 @@ Requires: pip install pyvisa pyvisa-py numpy tkinter
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import tkinter.font as tkfont
+import hashlib
+import os
+import re
 import threading
-from rigol_dg import RigolDG, wav_to_csv
+import queue
+import random
+import time
+from collections import deque
+from functools import partial, wraps
+from concurrent.futures import ThreadPoolExecutor
+from rigol_dg import RigolDG, wav_to_array
 import numpy as np
 import pyvisa as visa
 
+try:
+    import numexpr  # Optional: vectorized sin/exp for the ARB shapes
+except ImportError:
+    numexpr = None
+
+# Display strings for amplitude units as returned by SOURx:VOLT:UNIT?
+_UNIT_DISPLAY = {"VPP": "Vpp", "VRMS": "Vrms", "DBM": "dBm"}
+
+# Parameter label text for each amplitude / frequency unit
+_AMPL_LABEL = {"VPP": "Amplitude (Vpp):", "VRMS": "Amplitude (Vrms):", "DBM": "Power (dBm):"}
+_FREQ_LABEL = {"HZ": "Frequency (Hz):", "KHZ": "Frequency (kHz):", "MHZ": "Frequency (MHz):"}
+
+# Multiplier from each frequency unit choice to Hz
+_FREQ_SCALE = {"HZ": 1.0, "KHZ": 1e3, "MHZ": 1e6}
+
+# Display strings for frequency unit choices
+_FREQ_DISPLAY = {"HZ": "Hz", "KHZ": "kHz", "MHZ": "MHz"}
+
+# Decimal places shown for a frequency in each unit
+_FREQ_DECIMALS = {"HZ": 1, "KHZ": 3, "MHZ": 3}
+
+
+def _read_freq(value_var, unit_var):
+    """Return the frequency in Hz entered in a value/unit variable pair"""
+    return _parse_num(value_var.get()) * _FREQ_SCALE[unit_var.get()]
+
+
+def _scale_freq(freq_hz):
+    """Return (value, unit) expressing a frequency in Hz, kHz or MHz"""
+    if freq_hz >= 1e6:
+        return freq_hz / 1e6, "MHZ"
+    if freq_hz >= 1e3:
+        return freq_hz / 1e3, "KHZ"
+    return freq_hz, "HZ"
+
+
+def _format_freq(freq_hz):
+    """Format a frequency in Hz with the most appropriate unit"""
+    value, unit = _scale_freq(freq_hz)
+    return f"{value:.{_FREQ_DECIMALS[unit]}f} {_FREQ_DISPLAY[unit]}"
+
+
+# Optional parameter widgets shown for each waveform type (hidden otherwise)
+_VISIBLE_PARAMS = {
+    "DUAL": frozenset({"freq2_label", "freq2_entry", "freq2_unit_combo", "freq2_apply"}),
+}
+
+# Grid placement of the optional parameter widgets
+_PARAM_GRID = {
+    "freq2_label": dict(row=0, column=4, sticky="w", padx=(20, 0)),
+    "freq2_entry": dict(row=0, column=5, padx=5),
+    "freq2_unit_combo": dict(row=0, column=6, padx=2),
+    "freq2_apply": dict(row=0, column=7, padx=5),
+}
+
+
+def _make_fonts(root):
+    """Create the fonts shared by the application windows"""
+    return {
+        "title": tkfont.Font(root=root, family="Arial", size=12, weight="bold"),
+        "mono": tkfont.Font(root=root, family="Courier", size=9),
+        "mono_sm": tkfont.Font(root=root, family="Courier", size=8),
+    }
+
+
+def _needs_connection(fn):
+    """
+    Decorator for handlers that talk to the generator
+
+    Shows an error if not connected, otherwise calls fn(self, gen, ...)
+    with the current RigolDG instance and reports exceptions in a dialog.
+    """
+    @wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        gen = self._current_gen()
+        if gen is None:
+            messagebox.showerror("Error", "Not connected to generator")
+            return
+        try:
+            return fn(self, gen, *args, **kwargs)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+    return wrapper
+
+
+# Numeric entry text: a number or a prefix of one while typing, with either
+# an exponent or (in fields without a unit selector) a k/M suffix. Shared by
+# the key validator and the parser so both accept the same input
+_NUM_INPUT_RE = re.compile(r"([-+]?\d*\.?\d*)(?:([eE][-+]?\d*)|([kM]))?")
+_SI_MULT = {"k": 1e3, "M": 1e6}
+
+
+def _is_number_input(text, suffix=False):
+    """Tk validatecommand: True if text is a number or could become one"""
+    m = _NUM_INPUT_RE.fullmatch(text)
+    return m is not None and (suffix or m.group(3) is None)
+
+
+def _parse_num(text, suffix=False):
+    """
+    Return the value of a numeric entry such as 2.5e6 (or 2.5M if suffix)
+
+    Raises ValueError for incomplete or invalid text.
+    """
+    m = _NUM_INPUT_RE.fullmatch(text)
+    if m is None or not (suffix or m.group(3) is None):
+        raise ValueError(f"Invalid number: '{text}'")
+    mantissa, exponent, si = m.groups()
+    try:
+        value = float(mantissa + (exponent or ""))
+    except ValueError:
+        raise ValueError(f"Invalid number: '{text}'") from None
+    return value * _SI_MULT[si] if si else value
+
+
+def _parse_count(text):
+    """Return a whole number of points entered as 8192 or 8.192k"""
+    value = _parse_num(text, suffix=True)
+    count = round(value)
+    if count <= 0 or abs(value - count) > 1e-9 * count:
+        raise ValueError(f"Not a whole number of points: '{text}'")
+    return count
+
+
+def _set_text(widget, text):
+    """Replace the contents of a read-only Text widget in one call"""
+    widget.configure(state="normal")
+    widget.replace("1.0", tk.END, text)
+    widget.configure(state="disabled")
+
+
+def _param_row(parent, row, label, var, on_apply, unit_var=None, unit_values=None, width=15,
+               vcmd=None):
+    """
+    Grid a parameter row: Label, Entry, optional unit Combobox and Apply button
+
+    Args:
+        parent: Container widget (grid geometry)
+        row: Grid row
+        label: Label text
+        var: Variable bound to the entry
+        on_apply: Callback for the Apply button
+        unit_var: Variable bound to the unit combobox (only with unit_values)
+        unit_values: Unit choices; if None no combobox is created
+        width: Entry width in characters
+        vcmd: Optional key validatecommand for the entry
+
+    Returns:
+        tuple: (label, entry, unit_combo, button) - unit_combo is None without units
+    """
+    label_widget = ttk.Label(parent, text=label)
+    label_widget.grid(row=row, column=0, sticky="w")
+
+    entry = ttk.Entry(parent, textvariable=var, width=width)
+    if vcmd is not None:
+        entry.configure(validate="key", validatecommand=vcmd)
+    entry.grid(row=row, column=1, padx=5)
+
+    unit_combo = None
+    column = 2
+    if unit_values:
+        unit_combo = ttk.Combobox(parent, textvariable=unit_var, width=8,
+                                  values=unit_values, state="readonly")
+        unit_combo.grid(row=row, column=2, padx=2)
+        column = 3
+
+    button = ttk.Button(parent, text="Apply", command=on_apply)
+    button.grid(row=row, column=column, padx=5)
+
+    return label_widget, entry, unit_combo, button
+
+
+# Delay before a parameter Apply is sent; later clicks within it replace it
+_DEBOUNCE_MS = 150
+
+# Longest wait on exit for the VISA worker to finish and close the session (s)
+_CLOSE_TIMEOUT_S = 3.0
+
+# Channel parameters read back by read_status. Only these are remembered
+# and skipped when unchanged; the others (offset, phase, duty, load) can
+# be changed on the front panel without the GUI ever seeing it
+_READBACK_PARAMS = frozenset({"freq", "ampl", "ampl_unit"})
+
+# Channel status auto-refresh period and random spread (ms); the spread
+# keeps the two channels' polls from lining up
+_STATUS_POLL_MS = 500
+_STATUS_POLL_JITTER_MS = 100
+
+
+# Maximum number of lines kept in the debug log widget
+_MAX_LOG_LINES = 5000
+
+
+def _log_tag(entry):
+    """Return the debug log colour tag for a log entry ("" for none)"""
+    if "ERROR" in entry:
+        return "error"
+    if "TX:" in entry:
+        return "tx"
+    if "RX:" in entry:
+        return "rx"
+    return ""
+
+
+# ARB time grids by point count, bounded by total size (oldest evicted)
+_T_GRIDS = {}
+_T_GRIDS_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _t_grid(points):
+    """Read-only float32 grid over [-pi, pi] used by the ARB shapes (cached)"""
+    t = _T_GRIDS.pop(points, None)
+    if t is None:
+        t = np.linspace(-np.pi, np.pi, points, dtype=np.float32)
+        t.flags.writeable = False
+        total = t.nbytes + sum(g.nbytes for g in _T_GRIDS.values())
+        while _T_GRIDS and total > _T_GRIDS_MAX_BYTES:
+            total -= _T_GRIDS.pop(next(iter(_T_GRIDS))).nbytes
+    _T_GRIDS[points] = t  # Re-inserted as most recently used
+    return t
+
+
+def _arb_sinc(t, out):
+    out[:] = np.sinc(t)
+
+
+def _arb_gauss(t, out):
+    if numexpr is not None:
+        numexpr.evaluate("exp(-0.5 * t * t)", local_dict={"t": t},
+                         out=out, casting="same_kind")
+        return
+    np.square(t, out=out)
+    out *= -0.5
+    np.exp(out, out=out)
+
+
+def _arb_exponential(t, out):
+    if numexpr is not None:
+        numexpr.evaluate("exp(-abs(t))", local_dict={"t": t},
+                         out=out, casting="same_kind")
+        return
+    np.abs(t, out=out)
+    np.negative(out, out=out)
+    np.exp(out, out=out)
+
+
+def _arb_chirp(t, out):
+    if numexpr is not None:
+        numexpr.evaluate("sin(t * t)", local_dict={"t": t},
+                         out=out, casting="same_kind")
+        return
+    np.square(t, out=out)
+    np.sin(out, out=out)
+
+
+# generate_arb shapes: name -> fn(t, out) writing the samples into out
+_ARB_SHAPES = {
+    "sinc": _arb_sinc,
+    "gauss": _arb_gauss,
+    "exponential": _arb_exponential,
+    "chirp": _arb_chirp,
+}
+
+
+# Last VISA enumeration result, reused for a few seconds to avoid re-scanning
+_ENUM_CACHE = {'t': 0.0, 'res': ()}
+_ENUM_CACHE_TTL = 5.0  # seconds
+
+
+# Resource types identified automatically; others (TCPIP, GPIB) can stall
+# for seconds on open, so they are only probed on request
+_AUTO_PROBE_PREFIXES = ("USB", "ASRL")
+
+
 class DeviceSelectionDialog:
-    def __init__(self, parent):
+    def __init__(self, parent, fonts=None, rm=None):
         self.result = None
+        self.fonts = fonts if fonts is not None else _make_fonts(parent)
+
+        # Single ResourceManager reused for scanning and identification;
+        # a shared one passed in by the caller is not closed here
+        self._own_rm = rm is None
+        self.rm = visa.ResourceManager('@py') if rm is None else rm
+
+        # Scan results posted by the worker thread
+        self._scan_queue = queue.Queue()
+        self._drain_job = None
+        self._scan_generation = 0  # bumped per scan; older results are dropped
+
+        # *IDN? answers collected by background probes, keyed by resource
+        self.idn_cache = {}
+        self._idn_futures = {}
+        self._idn_pool = ThreadPoolExecutor(max_workers=8)
+
+        # Open probe sessions, kept until the dialog closes so re-probing
+        # a device does not pay the open cost again; probes finishing after
+        # close() (_closed set) close their own session instead
+        self._probe_sessions = {}
+        # Guards the probe dicts above, shared with the scan and probe threads
+        self._probe_lock = threading.Lock()
+        self._closed = False
+
+        # Resource shown in the info box; late probe answers for others are dropped
+        self._selected_resource = None
+
+        # Resource name of each device list row (empty when showing a message)
+        self._resources = []
+
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("VISA Device Selection")
         self.dialog.geometry("600x400")
         self.dialog.resizable(False, False)
         self.dialog.grab_set()  # Modal window
         self.dialog.transient(parent)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
 
         # Center the window
         self.dialog.geometry("+{}+{}".format(
@@ -37,15 +353,19 @@ class DeviceSelectionDialog:
 
         # Title
         title_label = ttk.Label(main_frame, text="Select VISA Device",
-                               font=("Arial", 12, "bold"))
+                               font=self.fonts["title"])
         title_label.pack(pady=(0, 20))
 
         # Scan area
         scan_frame = ttk.Frame(main_frame)
         scan_frame.pack(fill="x", pady=(0, 10))
 
-        ttk.Button(scan_frame, text="🔄 Rescan Devices",
-                  command=self.scan_devices).pack(side="left")
+        self.rescan_btn = ttk.Button(scan_frame, text="🔄 Rescan Devices",
+                                     command=self.scan_devices)
+        self.rescan_btn.pack(side="left")
+        self.force_rescan_btn = ttk.Button(scan_frame, text="Force Rescan",
+                                           command=lambda: self.scan_devices(force=True))
+        self.force_rescan_btn.pack(side="left", padx=(5, 0))
 
         self.scan_status = ttk.Label(scan_frame, text="")
         self.scan_status.pack(side="left", padx=(10, 0))
@@ -60,7 +380,7 @@ class DeviceSelectionDialog:
         listbox_frame = ttk.Frame(list_frame)
         listbox_frame.pack(fill="both", expand=True, pady=(5, 0))
 
-        self.device_listbox = tk.Listbox(listbox_frame, height=8, font=("Courier", 9))
+        self.device_listbox = tk.Listbox(listbox_frame, height=8, font=self.fonts["mono"])
         scrollbar = ttk.Scrollbar(listbox_frame, orient="vertical", command=self.device_listbox.yview)
         self.device_listbox.configure(yscrollcommand=scrollbar.set)
 
@@ -71,7 +391,11 @@ class DeviceSelectionDialog:
         info_frame = ttk.LabelFrame(main_frame, text="Device Information", padding=10)
         info_frame.pack(fill="x", pady=(0, 20))
 
-        self.device_info = tk.Text(info_frame, height=4, wrap="word", font=("Courier", 8))
+        self.probe_btn = ttk.Button(info_frame, text="Probe", state="disabled",
+                                    command=self._probe_selected)
+        self.probe_btn.pack(side="right", anchor="n", padx=(10, 0))
+
+        self.device_info = tk.Text(info_frame, height=4, wrap="word", font=self.fonts["mono_sm"])
         self.device_info.pack(fill="x")
 
         # Events
@@ -97,57 +421,187 @@ class DeviceSelectionDialog:
         ttk.Button(manual_frame, text="Use",
                   command=self.use_manual).pack(side="left", padx=(5, 0))
 
-    def scan_devices(self):
+    def scan_devices(self, force=False):
+        """
+        List available VISA resources
+
+        The enumeration runs in a worker thread; results are collected by
+        _drain_scan_queue on the Tk thread.
+
+        Args:
+            force: Ignore cached enumeration results and query the backend again
+        """
         self.scan_status.config(text="Scanning...")
         self.device_listbox.delete(0, tk.END)
+        self._resources = []
         self.device_info.delete(1.0, tk.END)
-        self.dialog.update()
-
+        self._selected_resource = None
+        self._set_scan_buttons("disabled")
+
+        if force:
+            # Re-identify devices too; open probe sessions are reused
+            with self._probe_lock:
+                self.idn_cache.clear()
+                self._idn_futures.clear()
+
+        self._scan_generation += 1
+        threading.Thread(target=self._scan_worker,
+                         args=(force, self._scan_generation), daemon=True).start()
+        if self._drain_job is None:
+            self._drain_job = self.dialog.after(50, self._drain_scan_queue)
+
+    def _set_scan_buttons(self, state):
+        """Enable or disable the rescan buttons"""
+        self.rescan_btn.config(state=state)
+        self.force_rescan_btn.config(state=state)
+
+    def _scan_worker(self, force, generation):
+        """Enumerate VISA resources (runs in a worker thread)"""
         try:
-            rm = visa.ResourceManager('@py')
-            resources = rm.list_resources()
-
-            if not resources:
-                self.device_listbox.insert(tk.END, "No VISA devices found")
-                self.scan_status.config(text="❌ No devices found")
+            if not force and time.monotonic() - _ENUM_CACHE['t'] < _ENUM_CACHE_TTL:
+                resources = _ENUM_CACHE['res']
             else:
-                for i, res in enumerate(resources):
-                    self.device_listbox.insert(tk.END, f"{i}: {res}")
-                self.scan_status.config(text=f"✅ Found {len(resources)} devices")
-
-            rm.close()
+                resources = self.rm.list_resources()
+                if resources:
+                    _ENUM_CACHE['t'] = time.monotonic()
+                    _ENUM_CACHE['res'] = resources
+            self._scan_queue.put((generation, resources, None))
+
+            # Identify devices concurrently so selecting one is a cache lookup
+            for res in resources:
+                if res.startswith(_AUTO_PROBE_PREFIXES):
+                    self._probe_async(res)
         except Exception as e:
-            self.device_listbox.insert(tk.END, f"Scan error: {str(e)}")
+            self._scan_queue.put((generation, None, e))
+
+    def _drain_scan_queue(self):
+        """Populate the device list once the scan worker has finished"""
+        # Keep only the result of the latest scan; superseded ones are dropped
+        result = None
+        try:
+            while True:
+                item = self._scan_queue.get_nowait()
+                if item[0] == self._scan_generation:
+                    result = item
+        except queue.Empty:
+            pass
+        if result is None:
+            self._drain_job = self.dialog.after(50, self._drain_scan_queue)
+            return
+
+        self._drain_job = None
+        self._set_scan_buttons("normal")
+        _, resources, error = result
+        if error is not None:
+            self.device_listbox.insert(tk.END, f"Scan error: {str(error)}")
             self.scan_status.config(text="❌ Scan error")
+        elif not resources:
+            self.device_listbox.insert(tk.END, "No VISA devices found")
+            self.scan_status.config(text="❌ No devices found")
+        else:
+            self._resources = list(resources)
+            self.device_listbox.insert(tk.END, *self._resources)
+            self.scan_status.config(text=f"✅ Found {len(resources)} devices")
 
     def on_device_select(self, event):
         selection = self.device_listbox.curselection()
         if not selection:
             return
 
-        line = self.device_listbox.get(selection[0])
-        if ":" not in line or "No" in line or "error" in line:
+        self.probe_btn.config(state="disabled")
+        if selection[0] >= len(self._resources):
+            self._selected_resource = None
             self.device_info.delete(1.0, tk.END)
             return
 
-        # Extract VISA address
-        resource_name = line.split(": ", 1)[1]
+        resource_name = self._resources[selection[0]]
+        self._selected_resource = resource_name
 
-        # Show device information
-        self.device_info.delete(1.0, tk.END)
-        self.device_info.insert(tk.END, f"Address: {resource_name}\n")
+        idn = self.idn_cache.get(resource_name)
+        if idn is not None:
+            self._show_device_info(resource_name, idn)
+            return
+
+        # Slow resource types wait for the Probe button unless already running
+        if (not resource_name.startswith(_AUTO_PROBE_PREFIXES)
+                and resource_name not in self._idn_futures):
+            self._show_device_info(resource_name, "(press Probe)")
+            self.probe_btn.config(state="normal")
+            return
+
+        self._query_idn(resource_name)
+
+    def _probe_selected(self):
+        """Probe button: identify the selected TCPIP/GPIB device"""
+        self.probe_btn.config(state="disabled")
+        if self._selected_resource is not None:
+            self._query_idn(self._selected_resource)
+
+    def _query_idn(self, resource_name):
+        """Start (or reuse) a probe and show its answer when it arrives"""
+        self._show_device_info(resource_name, "querying...")
+        future = self._probe_async(resource_name)
+        future.add_done_callback(
+            lambda f: f.cancelled() or self._post_idn(resource_name, f.result()))
 
-        # Try to get device ID
+    def _show_device_info(self, resource_name, idn):
+        """Replace the info box contents with one insert"""
+        self.device_info.delete(1.0, tk.END)
+        self.device_info.insert(tk.END, f"Address: {resource_name}\nIdentification: {idn}")
+
+    def _probe_async(self, resource_name):
+        """Start (or reuse) a background *IDN? probe and return its future"""
+        # Called from both the scan thread and the Tk thread
+        with self._probe_lock:
+            future = self._idn_futures.get(resource_name)
+            if future is None:
+                future = self._idn_pool.submit(self._probe_idn, resource_name)
+                self._idn_futures[resource_name] = future
+        return future
+
+    def _probe_idn(self, resource_name):
+        """Query *IDN? of a resource (runs in the probe pool)"""
+        instr = self._probe_sessions.get(resource_name)
         try:
-            rm = visa.ResourceManager('@py')
-            instr = rm.open_resource(resource_name)
-            instr.timeout = 2000
+            if instr is None:
+                instr = self.rm.open_resource(resource_name, open_timeout=500)
+                instr.timeout = 400
             idn = instr.query("*IDN?").strip()
-            self.device_info.insert(tk.END, f"Identification: {idn}")
-            instr.close()
-            rm.close()
-        except:
-            self.device_info.insert(tk.END, "Identification: Not available")
+        except Exception:
+            # Drop the session and allow a later selection to retry the probe
+            with self._probe_lock:
+                self._probe_sessions.pop(resource_name, None)
+            if instr is not None:
+                try:
+                    instr.close()
+                except Exception:
+                    pass
+            with self._probe_lock:
+                self._idn_futures.pop(resource_name, None)
+            return "Not available"
+
+        with self._probe_lock:
+            keep = not self._closed
+            if keep:
+                self._probe_sessions[resource_name] = instr
+            self.idn_cache[resource_name] = idn
+        if not keep:
+            try:
+                instr.close()
+            except Exception:
+                pass
+        return idn
+
+    def _post_idn(self, resource_name, idn):
+        """Show a probe result in the info box (called from a worker thread)"""
+        def show():
+            # Ignore answers for a device that is no longer selected
+            if self._selected_resource == resource_name:
+                self._show_device_info(resource_name, idn)
+        try:
+            self.dialog.after(0, show)
+        except (tk.TclError, RuntimeError):
+            pass  # Dialog closed while the probe was running
 
     def connect_device(self):
         selection = self.device_listbox.curselection()
@@ -155,13 +609,12 @@ class DeviceSelectionDialog:
             messagebox.showwarning("Warning", "Select a device from the list")
             return
 
-        line = self.device_listbox.get(selection[0])
-        if ":" not in line or "No" in line or "error" in line:
+        if selection[0] >= len(self._resources):
             messagebox.showwarning("Warning", "Select a valid device")
             return
 
-        self.result = line.split(": ", 1)[1]
-        self.dialog.destroy()
+        self.result = self._resources[selection[0]]
+        self.close()
 
     def use_manual(self):
         address = self.manual_entry.get().strip()
@@ -169,23 +622,174 @@ class DeviceSelectionDialog:
             messagebox.showwarning("Warning", "Enter a valid VISA address")
             return
         self.result = address
-        self.dialog.destroy()
+        self.close()
 
     def cancel(self):
         self.result = None
+        self.close()
+
+    def close(self):
+        """Stop pending scan polling, release VISA resources and close the dialog"""
+        if self._drain_job is not None:
+            self.dialog.after_cancel(self._drain_job)
+            self._drain_job = None
+        with self._probe_lock:
+            self._closed = True
+            sessions = list(self._probe_sessions.values())
+            self._probe_sessions.clear()
+        # When a device was chosen, let running probes (bounded by their
+        # open and query timeouts) release it before the real connect
+        self._idn_pool.shutdown(wait=self.result is not None, cancel_futures=True)
+        for instr in sessions:
+            try:
+                instr.close()
+            except Exception:
+                pass
+        if self._own_rm:
+            self.rm.close()
         self.dialog.destroy()
 
+
 class RigolDGGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Rigol DG Controller")
         self.root.geometry("900x700")
 
+        # Current generator and connection flag; changed together under
+        # _gen_lock since the connect worker thread also sets them
         self.gen = None
         self.connected = False
+        self._gen_lock = threading.RLock()
+
+        # VISA ResourceManager shared by the device dialog and connections,
+        # opened on first use and closed when the window closes
+        self._rm = None
+        self._rm_lock = threading.Lock()
+
+        # Per-channel widgets and variables, e.g. self.ch[1]["freq"]
+        self.ch = {1: {}, 2: {}}
+
+        # Optional parameter widgets currently gridded on each channel tab
+        self._shown_params = {1: frozenset(), 2: frozenset()}
+
+        # Debug log entries pushed by the generator, waiting to be shown
+        # (thread-safe; oldest dropped beyond what the widget would keep)
+        self._log_q = deque(maxlen=_MAX_LOG_LINES)
+
+        # What the debug log widget shows: "lines" for log entries, the
+        # message text for a placeholder/message, None when stale
+        self._log_view = None
+        self._see_pending = False  # auto-scroll queued for the next idle cycle
+        self._log_seq = None  # generator debug_seq at the last auto-refresh
+        self._drain_pending = False  # log drain queued by a new entry
+
+        # Recent status query results: (channel, name) -> (timestamp, value);
+        # filled by the VISA worker, so always accessed under _cache_lock
+        self._query_cache = {}
+        self._cache_lock = threading.Lock()
+
+        # Channel commands run one at a time on a single VISA worker thread
+        # (VISA sessions are not thread-safe); see _submit
+        self._cmd_q = queue.Queue()
+        threading.Thread(target=self._visa_worker, daemon=True).start()
+
+        # Debounced commands not yet queued: (channel, param) -> (after id, command)
+        self._pending = {}
+
+        # Last value written to / read from the generator: (channel, param) -> value
+        self._shadow = {}
+        self._shadow_seq = 0  # bumped by each write _apply_param requests
+        self._syncing = False  # controls being filled from read_status
+
+        # Pending status auto-refresh timers: channel -> after id, and the
+        # channels whose poll query is still running (at most one chain each)
+        self._status_jobs = {}
+        self._status_inflight = set()
+
+        # Set by on_close: worker threads stop posting callbacks to Tk, whose
+        # event loop only runs until the session has been closed
+        self._closing = False
+
+        # Digest of the samples last sent to each channel's volatile ARB
+        # memory by generate_arb (a marker object while an upload is queued);
+        # dropped by anything else that changes the channel's waveform
+        self._last_arb = {}
+
+        # Debug log auto-refresh state (the debug tab is built lazily)
+        self.auto_refresh_active = False
+        self.auto_refresh_job = None
+        self._refresh_pending = None  # after_idle id of a queued refresh
+        self._refresh_times = deque(maxlen=10)  # recent refresh durations (s)
+
         self.debug_mode = tk.BooleanVar(value=False)
 
+        # Font objects created once and shared by all widgets
+        self.fonts = _make_fonts(root)
+
+        # Key validation for numeric entries, registered once as a Tcl command
+        self._num_vcmd = (root.register(_is_number_input), "%P")
+        self._si_vcmd = (root.register(partial(_is_number_input, suffix=True)), "%P")
+
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def _get_rm(self):
+        """Return the shared VISA ResourceManager, creating it on first use"""
+        with self._rm_lock:
+            if self._rm is None:
+                self._rm = visa.ResourceManager('@py')
+            return self._rm
+
+    def on_close(self):
+        """Close the connection and the VISA ResourceManager, then exit"""
+        if self._closing:
+            return
+        self._closing = True
+        for job in self._status_jobs.values():
+            self.root.after_cancel(job)
+        self._status_jobs.clear()
+        self._flush_debounced()
+        with self._gen_lock:
+            gen, self.gen, self.connected = self.gen, None, False
+        if gen is not None:
+            gen.debug_callback = None
+
+        # Close the session on the VISA worker, after the commands already
+        # queued, so it is never closed in the middle of a call; the Tk
+        # loop keeps running meanwhile and polls for completion
+        closed = threading.Event()
+
+        def close_gen():
+            try:
+                if gen is not None:
+                    gen.close()
+            except Exception:
+                pass
+            finally:
+                closed.set()
+
+        self._submit(close_gen)
+        self._finish_close(closed, time.monotonic() + _CLOSE_TIMEOUT_S)
+
+    def _finish_close(self, closed, deadline):
+        """Destroy the window once the session is closed or the deadline passes"""
+        if not closed.is_set():
+            if time.monotonic() < deadline:
+                self.root.after(50, self._finish_close, closed, deadline)
+                return
+            # Worker still busy: leave its resources to process exit
+            self.root.destroy()
+            return
+
+        with self._rm_lock:
+            if self._rm is not None:
+                try:
+                    self._rm.close()
+                except Exception:
+                    pass
+                self._rm = None
+        self.root.destroy()
 
     def setup_ui(self):
         """Create the graphical interface"""
@@ -214,30 +818,88 @@ class RigolDGGUI:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=10, pady=5)
 
-        # Tab Channel 1
+        # Tabs are created empty; their contents are built on first visit
         self.channel1_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.channel1_frame, text="Channel 1")
-        self.setup_channel_controls(self.channel1_frame, 1)
 
-        # Tab Channel 2
         self.channel2_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.channel2_frame, text="Channel 2")
-        self.setup_channel_controls(self.channel2_frame, 2)
 
-        # Tab Arbitrary waveforms
         self.arb_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.arb_frame, text="ARB Waveforms")
-        self.setup_arb_controls()
 
-        # Tab Debug
         self.debug_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.debug_frame, text="Debug")
-        self.setup_debug_controls()
+
+        self._tab_builders = {
+            str(self.channel1_frame): lambda: self.setup_channel_controls(self.channel1_frame, 1),
+            str(self.channel2_frame): lambda: self.setup_channel_controls(self.channel2_frame, 2),
+            str(self.arb_frame): self.setup_arb_controls,
+            str(self.debug_frame): self.setup_debug_controls,
+        }
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+        # Channel 1 is the initially selected tab; the others are filled in
+        # one per idle pass once the window has been drawn
+        self._build_tab(self.channel1_frame)
+        self.root.after_idle(self._build_next_tab)
+
+        # Ctrl+L clears the debug log from anywhere in the window
+        self.root.bind_all("<Control-l>", self._on_clear_log_key)
+        self.root.bind_all("<Control-L>", self._on_clear_log_key)
+
+        # === STATUS BAR ===
+        # Success messages go here instead of modal dialogs
+        self._status_var = tk.StringVar()
+        self._status_clear_job = None
+        ttk.Label(self.root, textvariable=self._status_var, anchor="w").grid(
+            row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 5))
 
         # Configure resizing
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(1, weight=1)
 
+    def _notify(self, msg):
+        """Show a message in the status bar for a few seconds"""
+        self._status_var.set(msg)
+        if self._status_clear_job is not None:
+            self.root.after_cancel(self._status_clear_job)
+        self._status_clear_job = self.root.after(3000, self._clear_status)
+
+    def _clear_status(self):
+        """Clear the status bar message"""
+        self._status_clear_job = None
+        self._status_var.set("")
+
+    def _on_clear_log_key(self, event):
+        """Ctrl+L handler: clear the debug log once the event loop is idle"""
+        self._build_tab(self.debug_frame)
+        self.root.after_idle(self.clear_debug_log)
+        return "break"
+
+    def _build_tab(self, tab):
+        """Build the contents of a notebook tab if not done yet"""
+        builder = self._tab_builders.pop(str(tab), None)
+        if builder is not None:
+            builder()
+
+    def _build_next_tab(self):
+        """Build one pending tab and reschedule until none are left"""
+        if not self._tab_builders:
+            return
+        # Dict order: Channel 2, ARB, Debug
+        self._tab_builders.pop(next(iter(self._tab_builders)))()
+        self.root.after_idle(self._build_next_tab)
+
+    def _on_tab_changed(self, event):
+        """Build the selected tab on its first visit"""
+        tab = self.notebook.select()
+        self._build_tab(tab)
+
+        # Auto-refresh skips the hidden debug tab; catch up when it is shown
+        if self.auto_refresh_active and tab == str(self.debug_frame):
+            self.refresh_debug_log()
+
     def setup_channel_controls(self, parent, channel):
         """Create controls for a channel"""
 
@@ -247,9 +909,10 @@ class RigolDGGUI:
 
         ttk.Label(wave_frame, text="Type:").grid(row=0, column=0, sticky="w")
         func_var = tk.StringVar(value="SIN")
-        setattr(self, f"ch{channel}_func", func_var)
+        self.ch[channel]["func"] = func_var
         func_combo = ttk.Combobox(wave_frame, textvariable=func_var, width=15,
-                                  values=["SIN", "SQU", "RAMP", "PULSE", "NOIS", "DC", "DUAL", "ARB"])
+                                  values=["SIN", "SQU", "RAMP", "PULSE", "NOIS", "DC", "DUAL", "ARB"],
+                                  state="readonly")
         func_combo.grid(row=0, column=1, padx=5)
         func_combo.bind("<<ComboboxSelected>>", lambda e: self.update_function_and_params(channel))
 
@@ -257,96 +920,76 @@ class RigolDGGUI:
         params_frame = ttk.LabelFrame(parent, text="Parameters", padding=10)
         params_frame.grid(row=1, column=0, sticky="ew", padx=10, pady=5)
 
+        c = self.ch[channel]
+
         # Frequency
-        freq_label = ttk.Label(params_frame, text="Frequency (Hz):")
-        freq_label.grid(row=0, column=0, sticky="w")
-        setattr(self, f"ch{channel}_freq_label", freq_label)
-
-        freq_var = tk.StringVar(value="1000")
-        setattr(self, f"ch{channel}_freq", freq_var)
-        freq_entry = ttk.Entry(params_frame, textvariable=freq_var, width=15)
-        freq_entry.grid(row=0, column=1, padx=5)
-
-        # Frequency unit
-        freq_unit_var = tk.StringVar(value="HZ")
-        setattr(self, f"ch{channel}_freq_unit", freq_unit_var)
-        freq_unit_combo = ttk.Combobox(params_frame, textvariable=freq_unit_var, width=8,
-                                       values=["HZ", "KHZ", "MHZ"], state="readonly")
-        freq_unit_combo.grid(row=0, column=2, padx=2)
+        c["freq"] = tk.StringVar(value="1000")
+        c["freq_unit"] = tk.StringVar(value="HZ")
+        c["freq_label"], c["freq_entry"], freq_unit_combo, _ = _param_row(
+            params_frame, 0, "Frequency (Hz):", c["freq"],
+            partial(self.set_frequency, channel),
+            unit_var=c["freq_unit"], unit_values=["HZ", "KHZ", "MHZ"], vcmd=self._num_vcmd)
         freq_unit_combo.bind("<<ComboboxSelected>>", lambda e: self.update_frequency_unit(channel))
 
-        ttk.Button(params_frame, text="Apply",
-                  command=lambda: self.set_frequency(channel)).grid(row=0, column=3, padx=5)
-
         # Frequency 2 (for DUAL-TONE) - initially hidden
         freq2_label = ttk.Label(params_frame, text="Frequency 2:")
-        setattr(self, f"ch{channel}_freq2_label", freq2_label)
+        self.ch[channel]["freq2_label"] = freq2_label
 
         freq2_var = tk.StringVar(value="1100")
-        setattr(self, f"ch{channel}_freq2", freq2_var)
-        freq2_entry = ttk.Entry(params_frame, textvariable=freq2_var, width=15)
-        setattr(self, f"ch{channel}_freq2_entry", freq2_entry)
+        self.ch[channel]["freq2"] = freq2_var
+        freq2_entry = ttk.Entry(params_frame, textvariable=freq2_var, width=15,
+                                validate="key", validatecommand=self._num_vcmd)
+        self.ch[channel]["freq2_entry"] = freq2_entry
 
         freq2_unit_var = tk.StringVar(value="HZ")
-        setattr(self, f"ch{channel}_freq2_unit", freq2_unit_var)
+        self.ch[channel]["freq2_unit"] = freq2_unit_var
         freq2_unit_combo = ttk.Combobox(params_frame, textvariable=freq2_unit_var, width=8,
                                         values=["HZ", "KHZ", "MHZ"], state="readonly")
-        setattr(self, f"ch{channel}_freq2_unit_combo", freq2_unit_combo)
+        self.ch[channel]["freq2_unit_combo"] = freq2_unit_combo
 
         freq2_apply_btn = ttk.Button(params_frame, text="Apply Dual-Tone",
-                                     command=lambda: self.set_dual_tone_params(channel))
-        setattr(self, f"ch{channel}_freq2_apply", freq2_apply_btn)
+                                     command=partial(self.set_dual_tone_params, channel))
+        self.ch[channel]["freq2_apply"] = freq2_apply_btn
 
         # Amplitude
-        ampl_label = ttk.Label(params_frame, text="Amplitude (Vpp):")
-        ampl_label.grid(row=1, column=0, sticky="w")
-        setattr(self, f"ch{channel}_ampl_label", ampl_label)
-
-        ampl_var = tk.StringVar(value="2")
-        setattr(self, f"ch{channel}_ampl", ampl_var)
-        ampl_entry = ttk.Entry(params_frame, textvariable=ampl_var, width=15)
-        ampl_entry.grid(row=1, column=1, padx=5)
-
-        # Amplitude unit
-        unit_var = tk.StringVar(value="VPP")
-        setattr(self, f"ch{channel}_ampl_unit", unit_var)
-        unit_combo = ttk.Combobox(params_frame, textvariable=unit_var, width=8,
-                                  values=["VPP", "VRMS", "DBM"], state="readonly")
-        unit_combo.grid(row=1, column=2, padx=2)
+        c["ampl"] = tk.StringVar(value="2")
+        c["ampl_unit"] = tk.StringVar(value="VPP")
+        c["ampl_label"], c["ampl_entry"], unit_combo, _ = _param_row(
+            params_frame, 1, "Amplitude (Vpp):", c["ampl"],
+            partial(self.set_amplitude, channel),
+            unit_var=c["ampl_unit"], unit_values=["VPP", "VRMS", "DBM"], vcmd=self._num_vcmd)
         unit_combo.bind("<<ComboboxSelected>>", lambda e: self.update_amplitude_unit(channel))
 
-        ttk.Button(params_frame, text="Apply",
-                  command=lambda: self.set_amplitude(channel)).grid(row=1, column=3, padx=5)
-
         # Offset
-        ttk.Label(params_frame, text="Offset (V):").grid(row=2, column=0, sticky="w")
-        offset_var = tk.StringVar(value="0")
-        setattr(self, f"ch{channel}_offset", offset_var)
-        offset_entry = ttk.Entry(params_frame, textvariable=offset_var, width=20)
-        offset_entry.grid(row=2, column=1, padx=5)
-
-        ttk.Button(params_frame, text="Apply",
-                  command=lambda: self.set_offset(channel)).grid(row=2, column=2, padx=5)
+        c["offset"] = tk.StringVar(value="0")
+        _, c["offset_entry"], _, _ = _param_row(
+            params_frame, 2, "Offset (V):", c["offset"],
+            partial(self.set_offset, channel), width=20, vcmd=self._num_vcmd)
 
         # Phase
-        ttk.Label(params_frame, text="Phase (°):").grid(row=3, column=0, sticky="w")
-        phase_var = tk.StringVar(value="0")
-        setattr(self, f"ch{channel}_phase", phase_var)
-        phase_entry = ttk.Entry(params_frame, textvariable=phase_var, width=20)
-        phase_entry.grid(row=3, column=1, padx=5)
-
-        ttk.Button(params_frame, text="Apply",
-                  command=lambda: self.set_phase(channel)).grid(row=3, column=2, padx=5)
+        c["phase"] = tk.StringVar(value="0")
+        _, c["phase_entry"], _, _ = _param_row(
+            params_frame, 3, "Phase (°):", c["phase"],
+            partial(self.set_phase, channel), width=20, vcmd=self._num_vcmd)
 
         # Duty Cycle (for square wave)
-        ttk.Label(params_frame, text="Duty Cycle (%):").grid(row=4, column=0, sticky="w")
-        duty_var = tk.StringVar(value="50")
-        setattr(self, f"ch{channel}_duty", duty_var)
-        duty_entry = ttk.Entry(params_frame, textvariable=duty_var, width=20)
-        duty_entry.grid(row=4, column=1, padx=5)
-
-        ttk.Button(params_frame, text="Apply",
-                  command=lambda: self.set_duty_cycle(channel)).grid(row=4, column=2, padx=5)
+        c["duty"] = tk.StringVar(value="50")
+        _, c["duty_entry"], _, _ = _param_row(
+            params_frame, 4, "Duty Cycle (%):", c["duty"],
+            partial(self.set_duty_cycle, channel), width=20, vcmd=self._num_vcmd)
+
+        # All of the above in one SCPI write
+        ttk.Button(params_frame, text="Apply All",
+                  command=partial(self.apply_channel_all, channel)).grid(row=5, column=0, columnspan=4, pady=(10, 0))
+
+        # Optionally apply edits without clicking Apply (debounced like Apply)
+        c["auto_apply"] = tk.BooleanVar(value=False)
+        ttk.Checkbutton(params_frame, text="Auto-apply", variable=c["auto_apply"]).grid(
+            row=5, column=4, columnspan=2, sticky="w", pady=(10, 0))
+        for key, apply in (("freq", self.set_frequency), ("ampl", self.set_amplitude),
+                           ("offset", self.set_offset), ("phase", self.set_phase),
+                           ("duty", self.set_duty_cycle)):
+            c[key].trace_add("write", partial(self._on_param_edit, channel, key, apply))
 
         # === MODULATION ===
         mod_frame = ttk.LabelFrame(parent, text="Modulation", padding=10)
@@ -355,34 +998,38 @@ class RigolDGGUI:
         # AM
         ttk.Label(mod_frame, text="AM - Depth (%):").grid(row=0, column=0, sticky="w")
         am_depth_var = tk.StringVar(value="50")
-        setattr(self, f"ch{channel}_am_depth", am_depth_var)
-        ttk.Entry(mod_frame, textvariable=am_depth_var, width=15).grid(row=0, column=1, padx=5)
+        self.ch[channel]["am_depth"] = am_depth_var
+        ttk.Entry(mod_frame, textvariable=am_depth_var, width=15,
+                  validate="key", validatecommand=self._num_vcmd).grid(row=0, column=1, padx=5)
 
         ttk.Label(mod_frame, text="Freq (Hz):").grid(row=0, column=2, sticky="w")
         am_freq_var = tk.StringVar(value="10")
-        setattr(self, f"ch{channel}_am_freq", am_freq_var)
-        ttk.Entry(mod_frame, textvariable=am_freq_var, width=15).grid(row=0, column=3, padx=5)
+        self.ch[channel]["am_freq"] = am_freq_var
+        ttk.Entry(mod_frame, textvariable=am_freq_var, width=15,
+                  validate="key", validatecommand=self._si_vcmd).grid(row=0, column=3, padx=5)
 
         ttk.Button(mod_frame, text="Enable AM",
-                  command=lambda: self.set_am_modulation(channel)).grid(row=0, column=4, padx=5)
+                  command=partial(self.set_am_modulation, channel)).grid(row=0, column=4, padx=5)
 
         # FM
         ttk.Label(mod_frame, text="FM - Dev (Hz):").grid(row=1, column=0, sticky="w")
         fm_dev_var = tk.StringVar(value="100")
-        setattr(self, f"ch{channel}_fm_dev", fm_dev_var)
-        ttk.Entry(mod_frame, textvariable=fm_dev_var, width=15).grid(row=1, column=1, padx=5)
+        self.ch[channel]["fm_dev"] = fm_dev_var
+        ttk.Entry(mod_frame, textvariable=fm_dev_var, width=15,
+                  validate="key", validatecommand=self._si_vcmd).grid(row=1, column=1, padx=5)
 
         ttk.Label(mod_frame, text="Freq (Hz):").grid(row=1, column=2, sticky="w")
         fm_freq_var = tk.StringVar(value="10")
-        setattr(self, f"ch{channel}_fm_freq", fm_freq_var)
-        ttk.Entry(mod_frame, textvariable=fm_freq_var, width=15).grid(row=1, column=3, padx=5)
+        self.ch[channel]["fm_freq"] = fm_freq_var
+        ttk.Entry(mod_frame, textvariable=fm_freq_var, width=15,
+                  validate="key", validatecommand=self._si_vcmd).grid(row=1, column=3, padx=5)
 
         ttk.Button(mod_frame, text="Enable FM",
-                  command=lambda: self.set_fm_modulation(channel)).grid(row=1, column=4, padx=5)
+                  command=partial(self.set_fm_modulation, channel)).grid(row=1, column=4, padx=5)
 
         # Disable modulation
         ttk.Button(mod_frame, text="Disable Modulation",
-                  command=lambda: self.modulation_off(channel)).grid(row=2, column=0, columnspan=5, pady=10)
+                  command=partial(self.modulation_off, channel)).grid(row=2, column=0, columnspan=5, pady=10)
 
         # === OUTPUT ===
         output_frame = ttk.LabelFrame(parent, text="Output", padding=10)
@@ -390,40 +1037,49 @@ class RigolDGGUI:
 
         ttk.Label(output_frame, text="Load (Ω):").grid(row=0, column=0, sticky="w")
         load_var = tk.StringVar(value="50")
-        setattr(self, f"ch{channel}_load", load_var)
+        self.ch[channel]["load"] = load_var
         load_combo = ttk.Combobox(output_frame, textvariable=load_var, width=15,
                                   values=["50", "75", "600", "1000", "INF"])
         load_combo.grid(row=0, column=1, padx=5)
 
         ttk.Button(output_frame, text="Apply",
-                  command=lambda: self.set_output_load(channel)).grid(row=0, column=2, padx=5)
+                  command=partial(self.set_output_load, channel)).grid(row=0, column=2, padx=5)
 
         # ON/OFF buttons
         btn_frame = ttk.Frame(output_frame)
         btn_frame.grid(row=1, column=0, columnspan=3, pady=10)
 
         ttk.Button(btn_frame, text="OUTPUT ON",
-                  command=lambda: self.output_on(channel)).pack(side="left", padx=5)
+                  command=partial(self.output_on, channel)).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="OUTPUT OFF",
-                  command=lambda: self.output_off(channel)).pack(side="left", padx=5)
+                  command=partial(self.output_off, channel)).pack(side="left", padx=5)
 
         # Quick RF configuration
         rf_frame = ttk.Frame(output_frame)
         rf_frame.grid(row=2, column=0, columnspan=3, pady=10)
 
         ttk.Button(rf_frame, text="⚡ Config RF (50Ω + dBm)",
-                  command=lambda: self.set_rf_mode(channel)).pack(side="left", padx=5)
+                  command=partial(self.set_rf_mode, channel)).pack(side="left", padx=5)
 
         # === STATUS READING ===
         status_frame = ttk.LabelFrame(parent, text="Current Status", padding=10)
         status_frame.grid(row=4, column=0, sticky="ew", padx=10, pady=5)
 
-        status_text = tk.Text(status_frame, height=6, width=70)
-        status_text.grid(row=0, column=0, padx=5, pady=5)
-        setattr(self, f"ch{channel}_status", status_text)
-
-        ttk.Button(status_frame, text="Update Status",
-                  command=lambda: self.read_status(channel)).grid(row=1, column=0, pady=5)
+        # Read-only and rewritten as a whole, so a Label (one configure per
+        # refresh) rather than a Text; blank lines reserve the height
+        status_label = ttk.Label(status_frame, text="\n" * 5, width=70,
+                                 anchor="nw", justify="left", font="TkFixedFont")
+        status_label.grid(row=0, column=0, padx=5, pady=5)
+        c["status"] = status_label
+
+        status_btns = ttk.Frame(status_frame)
+        status_btns.grid(row=1, column=0, pady=5)
+        ttk.Button(status_btns, text="Update Status",
+                  command=partial(self.read_status, channel)).pack(side="left", padx=5)
+        c["auto_status"] = tk.BooleanVar(value=False)
+        ttk.Checkbutton(status_btns, text="Auto-refresh", variable=c["auto_status"],
+                        command=partial(self._toggle_status_poll, channel)).pack(
+            side="left", padx=5)
 
     def setup_arb_controls(self):
         """Create controls for arbitrary waveforms"""
@@ -435,7 +1091,7 @@ class RigolDGGUI:
         ttk.Label(csv_frame, text="Channel:").grid(row=0, column=0, sticky="w")
         self.arb_channel = tk.StringVar(value="1")
         ttk.Combobox(csv_frame, textvariable=self.arb_channel, width=10,
-                    values=["1", "2"]).grid(row=0, column=1, padx=5)
+                    values=["1", "2"], state="readonly").grid(row=0, column=1, padx=5)
 
         ttk.Label(csv_frame, text="Name:").grid(row=0, column=2, sticky="w", padx=(20,0))
         self.arb_name = tk.StringVar(value="CUSTOM")
@@ -461,9 +1117,9 @@ class RigolDGGUI:
                     values=["4096", "8192", "16384"]).grid(row=0, column=1, padx=5)
 
         ttk.Label(wav_frame, text="Channel:").grid(row=0, column=2, sticky="w", padx=(20,0))
-        self.wav_channel = tk.StringVar(value="0")
+        self.wav_channel = tk.StringVar(value="0 (Left/Mono)")
         ttk.Combobox(wav_frame, textvariable=self.wav_channel, width=10,
-                    values=["0 (Left/Mono)", "1 (Right)"]).grid(row=0, column=3, padx=5)
+                    values=["0 (Left/Mono)", "1 (Right)"], state="readonly").grid(row=0, column=3, padx=5)
 
         ttk.Button(wav_frame, text="Select WAV File",
                   command=self.load_wav).grid(row=1, column=0, columnspan=4, pady=10)
@@ -478,16 +1134,19 @@ class RigolDGGUI:
         ttk.Label(func_frame, text="Type:").grid(row=0, column=0, sticky="w")
         self.arb_type = tk.StringVar(value="sinc")
         ttk.Combobox(func_frame, textvariable=self.arb_type, width=15,
-                    values=["sinc", "gauss", "exponential", "chirp", "dual-tone"]).grid(row=0, column=1, padx=5)
+                    values=["sinc", "gauss", "exponential", "chirp", "dual-tone"],
+                    state="readonly").grid(row=0, column=1, padx=5)
 
         ttk.Label(func_frame, text="Points:").grid(row=0, column=2, sticky="w", padx=(20,0))
         self.arb_points = tk.StringVar(value="1000")
-        ttk.Entry(func_frame, textvariable=self.arb_points, width=15).grid(row=0, column=3, padx=5)
+        ttk.Entry(func_frame, textvariable=self.arb_points, width=15,
+                  validate="key", validatecommand=self._si_vcmd).grid(row=0, column=3, padx=5)
 
         # Dual-tone parameters
         ttk.Label(func_frame, text="Freq1:").grid(row=1, column=0, sticky="w")
         self.dual_tone_f1 = tk.StringVar(value="1000")
-        ttk.Entry(func_frame, textvariable=self.dual_tone_f1, width=10).grid(row=1, column=1, padx=5)
+        ttk.Entry(func_frame, textvariable=self.dual_tone_f1, width=10,
+                  validate="key", validatecommand=self._num_vcmd).grid(row=1, column=1, padx=5)
 
         self.dual_tone_f1_unit = tk.StringVar(value="HZ")
         ttk.Combobox(func_frame, textvariable=self.dual_tone_f1_unit, width=5,
@@ -495,7 +1154,8 @@ class RigolDGGUI:
 
         ttk.Label(func_frame, text="Freq2:").grid(row=1, column=3, sticky="w", padx=(10,0))
         self.dual_tone_f2 = tk.StringVar(value="1100")
-        ttk.Entry(func_frame, textvariable=self.dual_tone_f2, width=10).grid(row=1, column=4, padx=5)
+        ttk.Entry(func_frame, textvariable=self.dual_tone_f2, width=10,
+                  validate="key", validatecommand=self._num_vcmd).grid(row=1, column=4, padx=5)
 
         self.dual_tone_f2_unit = tk.StringVar(value="HZ")
         ttk.Combobox(func_frame, textvariable=self.dual_tone_f2_unit, width=5,
@@ -513,7 +1173,8 @@ class RigolDGGUI:
 
         ttk.Label(srate_frame, text="Sample Rate:").grid(row=0, column=0, sticky="w")
         self.arb_srate = tk.StringVar(value="1")
-        ttk.Entry(srate_frame, textvariable=self.arb_srate, width=15).grid(row=0, column=1, padx=5)
+        ttk.Entry(srate_frame, textvariable=self.arb_srate, width=15,
+                  validate="key", validatecommand=self._num_vcmd).grid(row=0, column=1, padx=5)
 
         self.arb_srate_unit = tk.StringVar(value="MHZ")
         ttk.Combobox(srate_frame, textvariable=self.arb_srate_unit, width=8,
@@ -538,14 +1199,18 @@ class RigolDGGUI:
         ttk.Label(manage_frame, text="Delete:").grid(row=2, column=0, sticky="w")
         self.arb_del_name = tk.StringVar()
         ttk.Entry(manage_frame, textvariable=self.arb_del_name, width=20).grid(row=2, column=1, padx=5)
-        ttk.Button(manage_frame, text="Delete",
-                  command=self.delete_arb).grid(row=2, column=2, padx=5)
+        # Delete asks for a second click instead of a confirmation dialog
+        ttk.Style(self.root).configure("Confirm.TButton", foreground="red")
+        self.arb_del_btn = ttk.Button(manage_frame, text="Delete", command=self.delete_arb)
+        self.arb_del_btn.grid(row=2, column=2, padx=5)
+        self._del_pending = None
+        self._del_reset_job = None
 
         # === INFO AREA ===
         info_frame = ttk.LabelFrame(self.arb_frame, text="Information", padding=10)
         info_frame.grid(row=5, column=0, sticky="ew", padx=10, pady=5)
 
-        self.arb_info = tk.Text(info_frame, height=8, width=70)
+        self.arb_info = tk.Text(info_frame, height=8, width=70, state="disabled")
         self.arb_info.grid(row=0, column=0, padx=5, pady=5)
 
     def setup_debug_controls(self):
@@ -572,18 +1237,29 @@ class RigolDGGUI:
 
         scrollbar = ttk.Scrollbar(text_frame)
         scrollbar.pack(side="right", fill="y")
-
-        self.debug_text = tk.Text(text_frame, height=25, width=90, font=("Courier", 9),
-                                  yscrollcommand=scrollbar.set)
+        xscrollbar = ttk.Scrollbar(text_frame, orient="horizontal")
+        xscrollbar.pack(side="bottom", fill="x")
+
+        # Log viewer: read-only, no undo history, no line wrapping
+        self.debug_text = tk.Text(text_frame, height=25, width=90, font=self.fonts["mono"],
+                                  undo=False, maxundo=0, wrap="none", state="disabled",
+                                  yscrollcommand=scrollbar.set,
+                                  xscrollcommand=xscrollbar.set)
         self.debug_text.pack(side="left", fill="both", expand=True)
         scrollbar.config(command=self.debug_text.yview)
+        xscrollbar.config(command=self.debug_text.xview)
+
+        # Colour tags used by refresh_debug_log
+        self.debug_text.tag_config("error", foreground="red")
+        self.debug_text.tag_config("tx", foreground="blue")
+        self.debug_text.tag_config("rx", foreground="green")
 
         # Buttons
         btn_frame = ttk.Frame(log_frame)
         btn_frame.pack(fill="x", pady=(10, 0))
 
         ttk.Button(btn_frame, text="Refresh Log", command=self.refresh_debug_log).pack(side="left", padx=5)
-        ttk.Button(btn_frame, text="Clear Log", command=self.clear_debug_log).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="Clear Log (Ctrl+L)", command=self.clear_debug_log).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="Auto-refresh", command=self.toggle_auto_refresh).pack(side="left", padx=5)
 
         self.auto_refresh_label = ttk.Label(btn_frame, text="OFF", foreground="red")
@@ -593,23 +1269,19 @@ class RigolDGGUI:
         self.debug_frame.rowconfigure(1, weight=1)
         self.debug_frame.columnconfigure(0, weight=1)
 
-        # Auto-refresh state
-        self.auto_refresh_active = False
-        self.auto_refresh_job = None
-
     # === CONNECTION METHODS ===
 
     def connect(self):
         """Connect to the generator"""
         if self.connected:
-            messagebox.showinfo("Info", "Already connected")
+            self._notify("Already connected")
             return
 
         visa_addr = self.visa_entry.get()
 
         # If auto-detect, show selection dialog
         if visa_addr == "Auto-detect" or visa_addr == "":
-            dialog = DeviceSelectionDialog(self.root)
+            dialog = DeviceSelectionDialog(self.root, fonts=self.fonts, rm=self._get_rm())
             self.root.wait_window(dialog.dialog)
 
             if dialog.result is None:
@@ -617,19 +1289,45 @@ class RigolDGGUI:
 
             visa_addr = dialog.result
 
+        # Reset the debug log state here on the Tk thread, before the new
+        # session can log anything
+        debug_enabled = self.debug_mode.get()
+        self._log_q.clear()
+        self._log_view = None  # drop the previous session's lines
+        self._log_seq = None
+
         def do_connect():
             try:
                 # Connect directly with the specified address
-                debug_enabled = self.debug_mode.get()
-                self.gen = RigolDG(visa_addr, debug=debug_enabled)
-
-                self.connected = True
+                gen = RigolDG(visa_addr, debug=debug_enabled,
+                              debug_callback=self._on_debug_entry,
+                              rm=self._get_rm())
+
+                def reset_state():
+                    self._invalidate_status()
+                    self._last_arb.clear()
+
+                self.root.after(0, reset_state)
+
+                # Query the ID here so the Tk thread never waits on VISA;
+                # close the session again if the device does not answer
+                try:
+                    idn = gen.identify()
+                except Exception:
+                    try:
+                        gen.close()
+                    except Exception:
+                        pass
+                    raise
+
+                with self._gen_lock:
+                    self.gen = gen
+                    self.connected = True
                 self.root.after(0, lambda: self.status_label.config(
-                    text=f"Connected: {self.gen.identify()}", foreground="green"))
+                    text=f"Connected: {idn}", foreground="green"))
                 self.root.after(0, lambda: self.connect_btn.config(state="disabled"))
                 self.root.after(0, lambda: self.disconnect_btn.config(state="normal"))
-                self.root.after(0, lambda: messagebox.showinfo(
-                    "Success", "Connected to generator"))
+                self.root.after(0, self._notify, "Connected to generator")
 
                 # Update the address field with the selected one
                 self.root.after(0, lambda: self.visa_entry.delete(0, tk.END))
@@ -642,8 +1340,8 @@ class RigolDGGUI:
 
     def disconnect(self):
         """Disconnect from the generator"""
-        if not self.connected or self.gen is None:
-            messagebox.showinfo("Info", "Not connected")
+        if self._current_gen() is None:
+            self._notify("Not connected")
             return
 
         try:
@@ -655,392 +1353,568 @@ class RigolDGGUI:
                     self.root.after_cancel(self.auto_refresh_job)
                     self.auto_refresh_job = None
 
-            # Close connection
-            self.gen.close()
-            self.gen = None
-            self.connected = False
-
-            # Update UI
-            self.status_label.config(text="Not connected", foreground="red")
-            self.connect_btn.config(state="normal")
+            # Close connection once queued commands have run
+            self._flush_debounced()
+            with self._gen_lock:
+                gen, self.gen, self.connected = self.gen, None, False
             self.disconnect_btn.config(state="disabled")
 
-            messagebox.showinfo("Success", "Disconnected from generator")
+            def reset_ui():
+                # Update UI
+                self.status_label.config(text="Not connected", foreground="red")
+                self.connect_btn.config(state="normal")
+
+            def done(_):
+                reset_ui()
+                self._notify("Disconnected from generator")
+
+            def failed(e):
+                reset_ui()
+                messagebox.showerror("Error", f"Disconnect error:\n{str(e)}")
+
+            self._submit(gen.close, on_ok=done, on_err=failed)
         except Exception as e:
             messagebox.showerror("Error", f"Disconnect error:\n{str(e)}")
 
+    def _current_gen(self):
+        """Return the connected RigolDG instance, or None"""
+        with self._gen_lock:
+            return self.gen if self.connected else None
+
     def check_connection(self):
         """Check active connection"""
-        if not self.connected or self.gen is None:
+        if self._current_gen() is None:
             messagebox.showerror("Error", "Not connected to generator")
             return False
         return True
 
+    def _submit(self, fn, *args, on_ok=None, on_err=None):
+        """
+        Queue fn(*args) for the VISA worker thread and return immediately
+
+        Args:
+            fn: Callable talking to the generator
+            on_ok: Optional callable receiving fn's result
+            on_err: Callable receiving the exception (default: error dialog)
+
+        Both callbacks run on the Tk thread.
+        """
+        self._cmd_q.put((fn, args, on_ok, on_err or self._show_error))
+
+    def _submit_debounced(self, key, fn, *args, on_ok=None, on_err=None):
+        """
+        Queue fn(*args) after a short delay, replacing a pending command for key
+
+        Repeated Apply clicks within _DEBOUNCE_MS send only the last value.
+
+        Args:
+            key: (channel, param) identifying the setting
+        """
+        self._cancel_debounced(key)
+        job = self.root.after(_DEBOUNCE_MS, self._flush_debounced, key)
+        self._pending[key] = (job, (fn, args, on_ok, on_err))
+
+    def _cancel_debounced(self, key):
+        """Drop the pending debounced command for key, if any"""
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            self.root.after_cancel(pending[0])
+
+    def _flush_debounced(self, key=None):
+        """Queue the pending debounced command for key (all of them if None)"""
+        keys = list(self._pending) if key is None else [key]
+        for k in keys:
+            job, (fn, args, on_ok, on_err) = self._pending.pop(k)
+            if key is None:
+                self.root.after_cancel(job)
+            self._submit(fn, *args, on_ok=on_ok, on_err=on_err)
+
+    def _visa_worker(self):
+        """Run queued generator commands in order (worker thread)"""
+        while True:
+            fn, args, on_ok, on_err = self._cmd_q.get()
+            try:
+                result = fn(*args)
+            except Exception as e:
+                callback, value = on_err, e
+            else:
+                callback, value = on_ok, result
+            if fn != self._query_status:
+                # Cached status may be stale once any other command has run
+                with self._cache_lock:
+                    self._query_cache.clear()
+            if callback is None or self._closing:
+                continue
+            try:
+                self.root.after(0, callback, value)
+            except (tk.TclError, RuntimeError):
+                pass  # Window closed while the command was running
+
+    def _show_error(self, error):
+        """Report a failed generator command"""
+        messagebox.showerror("Error", str(error))
+
+    def _cached_query(self, key, fn, ttl=0.2):
+        """
+        Return fn() reusing a result younger than ttl seconds
+
+        Args:
+            key: Cache key, (channel, name)
+            fn: Zero-argument callable performing the SCPI query
+            ttl: Maximum age of a cached value in seconds
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            hit = self._query_cache.get(key)
+        if hit is not None and now - hit[0] < ttl:
+            return hit[1]
+        value = fn()
+        with self._cache_lock:
+            self._query_cache[key] = (now, value)
+        return value
+
+    def _invalidate_status(self, channel=None):
+        """Drop cached status values for a channel (all channels if None; Tk thread)"""
+        with self._cache_lock:
+            if channel is None:
+                self._query_cache.clear()
+            else:
+                for key in [k for k in self._query_cache if k[0] == channel]:
+                    del self._query_cache[key]
+        if channel is None:
+            self._shadow.clear()  # ARB operations and reconnects change everything
+
+    def _forget_shadow(self, channel):
+        """Drop the known parameter values of a channel"""
+        for key in [k for k in self._shadow if k[0] == channel]:
+            del self._shadow[key]
+
+    def _apply_param(self, key, value, fn, *args, msg):
+        """
+        Write a channel parameter unless the generator already has that value
+
+        The shadow holds the value last requested, so it already covers a
+        write still waiting in the debounce delay or the command queue.
+
+        Args:
+            key: (channel, param) used for debouncing and the shadow state
+            value: Value compared with the last one written or read back
+            fn, args: Generator call performing the write
+            msg: Status bar message shown on success
+        """
+        if key[1] not in _READBACK_PARAMS:
+            self._submit_debounced(key, fn, *args, on_ok=lambda _: self._notify(msg))
+            return
+
+        if self._shadow.get(key) == value:
+            # A different value may still be pending (e.g. after a read back)
+            self._cancel_debounced(key)
+            self._notify(f"{msg} (unchanged)")
+            return
+
+        def failed(e):
+            if self._shadow.get(key) == value:
+                del self._shadow[key]
+            self._show_error(e)
+
+        self._shadow[key] = value
+        self._shadow_seq += 1
+        self._submit_debounced(key, fn, *args, on_ok=lambda _: self._notify(msg),
+                               on_err=failed)
+
     # === CHANNEL CONTROL METHODS ===
 
     def update_function_and_params(self, channel):
         """Update waveform and show/hide parameters based on function type"""
-        func = getattr(self, f"ch{channel}_func").get()
+        func = self.ch[channel]["func"].get()
 
         # Update function on device
         self.update_function(channel)
 
-        # Show/hide Frequency 2 controls based on function type
-        freq2_label = getattr(self, f"ch{channel}_freq2_label")
-        freq2_entry = getattr(self, f"ch{channel}_freq2_entry")
-        freq2_unit_combo = getattr(self, f"ch{channel}_freq2_unit_combo")
-        freq2_apply = getattr(self, f"ch{channel}_freq2_apply")
-
-        if func == "DUAL":
-            # Show Freq2 controls
-            freq2_label.grid(row=0, column=4, sticky="w", padx=(20, 0))
-            freq2_entry.grid(row=0, column=5, padx=5)
-            freq2_unit_combo.grid(row=0, column=6, padx=2)
-            freq2_apply.grid(row=0, column=7, padx=5)
-        else:
-            # Hide Freq2 controls
-            freq2_label.grid_remove()
-            freq2_entry.grid_remove()
-            freq2_unit_combo.grid_remove()
-            freq2_apply.grid_remove()
-
-    def update_function(self, channel):
-        """Update waveform"""
-        if not self.check_connection():
+        # Show/hide optional parameter controls, touching only widgets
+        # whose visibility actually changes
+        widgets = self.ch[channel]
+        shown = self._shown_params[channel]
+        visible = _VISIBLE_PARAMS.get(func, frozenset())
+        for key in visible - shown:
+            widgets[key].grid(**_PARAM_GRID[key])
+        for key in shown - visible:
+            widgets[key].grid_remove()
+        self._shown_params[channel] = visible
+
+    def _on_param_edit(self, channel, key, apply, *_):
+        """Variable trace: apply an edited parameter when Auto-apply is on"""
+        c = self.ch[channel]
+        if self._syncing or not self.connected or not c["auto_apply"].get():
             return
-
+        # Ignore partial input such as "" or "-" while the user is typing
         try:
-            func = getattr(self, f"ch{channel}_func").get()
-
-            # For DUAL, don't set the function yet - wait for Apply Dual-Tone button
-            if func == "DUAL":
-                messagebox.showinfo("Info", f"Channel {channel}: Ready for Dual-Tone\nSet both frequencies and click 'Apply Dual-Tone'")
-            else:
-                self.gen.set_function(channel, func)
-                messagebox.showinfo("OK", f"Channel {channel}: waveform → {func}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-
-    def set_dual_tone_params(self, channel):
-        """Set dual-tone with both frequencies"""
-        if not self.check_connection():
+            _parse_num(c[key].get())
+        except ValueError:
             return
+        apply(channel)
 
-        try:
-            # Get freq1
-            freq1_value = float(getattr(self, f"ch{channel}_freq").get())
-            freq1_unit = getattr(self, f"ch{channel}_freq_unit").get()
-            if freq1_unit == "KHZ":
-                freq1_value *= 1000
-            elif freq1_unit == "MHZ":
-                freq1_value *= 1000000
-
-            # Get freq2
-            freq2_value = float(getattr(self, f"ch{channel}_freq2").get())
-            freq2_unit = getattr(self, f"ch{channel}_freq2_unit").get()
-            if freq2_unit == "KHZ":
-                freq2_value *= 1000
-            elif freq2_unit == "MHZ":
-                freq2_value *= 1000000
-
-            # Get amplitude
-            ampl = float(getattr(self, f"ch{channel}_ampl").get())
-
-            # Apply dual-tone
-            self.gen.set_dual_tone(channel, freq1_value, freq2_value, ampl)
-
-            # Format for display
-            def format_freq(freq):
-                if freq >= 1000000:
-                    return f"{freq/1000000:.3f} MHz"
-                elif freq >= 1000:
-                    return f"{freq/1000:.3f} kHz"
-                else:
-                    return f"{freq:.1f} Hz"
-
-            messagebox.showinfo("OK",
-                f"Channel {channel}: Dual-Tone activated\n"
-                f"F1: {format_freq(freq1_value)}\n"
-                f"F2: {format_freq(freq2_value)}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+    @_needs_connection
+    def update_function(self, gen, channel):
+        """Update waveform"""
+        self._invalidate_status(channel)
+
+        func = self.ch[channel]["func"].get()
 
-    def set_frequency(self, channel):
+        # For DUAL, don't set the function yet - wait for Apply Dual-Tone button
+        if func == "DUAL":
+            # Inline hint next to the second frequency instead of a dialog
+            self.ch[channel]["freq2_label"].config(text="F2 (click Apply Dual-Tone) ►")
+        else:
+            # Other parameters may be adjusted to the new waveform's limits
+            self._forget_shadow(channel)
+            self._last_arb.pop(channel, None)
+            self._submit(gen.set_function, channel, func, on_ok=lambda _:
+                         self._notify(f"Channel {channel}: waveform → {func}"))
+
+    @_needs_connection
+    def set_dual_tone_params(self, gen, channel):
+        """Set dual-tone with both frequencies"""
+        c = self.ch[channel]
+        self._invalidate_status(channel)
+
+        # Get both frequencies in Hz
+        freq1_value = _read_freq(c["freq"], c["freq_unit"])
+        freq2_value = _read_freq(c["freq2"], c["freq2_unit"])
+
+        # Get amplitude
+        ampl = _parse_num(c["ampl"].get())
+
+        # Apply dual-tone
+        self._forget_shadow(channel)
+        self._last_arb.pop(channel, None)
+        msg = (f"Channel {channel}: Dual-Tone activated "
+               f"(F1: {_format_freq(freq1_value)}, F2: {_format_freq(freq2_value)})")
+        self._submit(gen.set_dual_tone, channel, freq1_value, freq2_value, ampl,
+                     on_ok=lambda _: self._notify(msg))
+
+    @_needs_connection
+    def set_frequency(self, gen, channel):
         """Set frequency with current unit"""
-        if not self.check_connection():
-            return
+        c = self.ch[channel]
+        self._invalidate_status(channel)
 
-        try:
-            freq_value = float(getattr(self, f"ch{channel}_freq").get())
-            freq_unit = getattr(self, f"ch{channel}_freq_unit").get()
+        freq_value = _parse_num(c["freq"].get())
+        freq_unit = c["freq_unit"].get()
 
-            # Use the method with unit
-            self.gen.set_frequency_with_unit(channel, freq_value, freq_unit)
+        # Message with correct unit
+        msg = f"Channel {channel}: frequency → {freq_value} {_FREQ_DISPLAY[freq_unit]}"
 
-            # Message with correct unit
-            unit_str = {"HZ": "Hz", "KHZ": "kHz", "MHZ": "MHz"}[freq_unit]
-            messagebox.showinfo("OK", f"Channel {channel}: frequency → {freq_value} {unit_str}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        # Use the method with unit
+        self._apply_param((channel, "freq"), freq_value * _FREQ_SCALE[freq_unit],
+                          gen.set_frequency_with_unit, channel, freq_value, freq_unit, msg=msg)
 
-    def set_amplitude(self, channel):
+    @_needs_connection
+    def set_amplitude(self, gen, channel):
         """Set amplitude with current unit"""
-        if not self.check_connection():
-            return
+        c = self.ch[channel]
+        self._invalidate_status(channel)
 
-        try:
-            ampl = float(getattr(self, f"ch{channel}_ampl").get())
-            unit = getattr(self, f"ch{channel}_ampl_unit").get()
+        ampl = _parse_num(c["ampl"].get())
+        unit = c["ampl_unit"].get()
 
-            # Set unit before value
-            self.gen.set_amplitude_unit(channel, unit)
-            self.gen.set_amplitude(channel, ampl)
+        # Message with correct unit
+        msg = f"Channel {channel}: amplitude → {ampl} {_UNIT_DISPLAY[unit]}"
 
-            # Message with correct unit
-            unit_str = {"VPP": "Vpp", "VRMS": "Vrms", "DBM": "dBm"}[unit]
-            messagebox.showinfo("OK", f"Channel {channel}: amplitude → {ampl} {unit_str}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        # Unit and value in one SCPI transaction (unit applied first)
+        self._apply_param((channel, "ampl"), (ampl, unit),
+                          gen.set_amplitude_with_unit, channel, ampl, unit, msg=msg)
 
-    def set_offset(self, channel):
+    @_needs_connection
+    def set_offset(self, gen, channel):
         """Set offset"""
-        if not self.check_connection():
-            return
+        self._invalidate_status(channel)
 
-        try:
-            offset = float(getattr(self, f"ch{channel}_offset").get())
-            self.gen.set_offset(channel, offset)
-            messagebox.showinfo("OK", f"Channel {channel}: offset → {offset} V")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        offset = _parse_num(self.ch[channel]["offset"].get())
+        self._apply_param((channel, "offset"), offset, gen.set_offset, channel, offset,
+                          msg=f"Channel {channel}: offset → {offset} V")
 
-    def set_phase(self, channel):
+    @_needs_connection
+    def set_phase(self, gen, channel):
         """Set phase"""
-        if not self.check_connection():
-            return
+        self._invalidate_status(channel)
 
-        try:
-            phase = float(getattr(self, f"ch{channel}_phase").get())
-            self.gen.set_phase(channel, phase)
-            messagebox.showinfo("OK", f"Channel {channel}: phase → {phase}°")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        phase = _parse_num(self.ch[channel]["phase"].get())
+        self._apply_param((channel, "phase"), phase, gen.set_phase, channel, phase,
+                          msg=f"Channel {channel}: phase → {phase}°")
 
-    def set_duty_cycle(self, channel):
+    @_needs_connection
+    def set_duty_cycle(self, gen, channel):
         """Set duty cycle"""
-        if not self.check_connection():
-            return
+        self._invalidate_status(channel)
+
+        duty = _parse_num(self.ch[channel]["duty"].get())
+        self._apply_param((channel, "duty"), duty, gen.set_duty_cycle, channel, duty,
+                          msg=f"Channel {channel}: duty cycle → {duty}%")
+
+    @_needs_connection
+    def apply_channel_all(self, gen, channel):
+        """Send frequency, amplitude, offset, phase, duty and load in one write"""
+        c = self.ch[channel]
+        self._invalidate_status(channel)
+
+        params = dict(
+            freq=_read_freq(c["freq"], c["freq_unit"]),
+            ampl=_parse_num(c["ampl"].get()),
+            ampl_unit=c["ampl_unit"].get(),
+            offset=_parse_num(c["offset"].get()),
+            phase=_parse_num(c["phase"].get()),
+            load=c["load"].get(),
+        )
+        # Duty cycle only applies to square waves
+        if c["func"].get() == "SQU":
+            params["duty"] = _parse_num(c["duty"].get())
 
-        try:
-            duty = float(getattr(self, f"ch{channel}_duty").get())
-            self.gen.set_duty_cycle(channel, duty)
-            messagebox.showinfo("OK", f"Channel {channel}: duty cycle → {duty}%")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        def done(_):
+            shadow = dict(params, ampl=(params["ampl"], params["ampl_unit"]))
+            self._shadow.update(((channel, k), v) for k, v in shadow.items()
+                                if k in _READBACK_PARAMS)
+            self._notify(f"Channel {channel}: all parameters applied")
 
-    def update_amplitude_unit(self, channel):
+        self._submit(partial(gen.configure_channel, channel, **params), on_ok=done)
+
+    @_needs_connection
+    def update_amplitude_unit(self, gen, channel):
         """Update amplitude unit and label"""
-        if not self.check_connection():
-            return
+        c = self.ch[channel]
+        self._invalidate_status(channel)
 
-        try:
-            unit = getattr(self, f"ch{channel}_ampl_unit").get()
-            self.gen.set_amplitude_unit(channel, unit)
+        unit = c["ampl_unit"].get()
+
+        def done(_):
+            # The amplitude value is now expressed in the new unit
+            self._shadow[(channel, "ampl_unit")] = unit
+            self._shadow.pop((channel, "ampl"), None)
 
             # Update label
-            label = getattr(self, f"ch{channel}_ampl_label")
-            if unit == "VPP":
-                label.config(text="Amplitude (Vpp):")
-            elif unit == "VRMS":
-                label.config(text="Amplitude (Vrms):")
-            elif unit == "DBM":
-                label.config(text="Power (dBm):")
-
-            messagebox.showinfo("OK", f"Channel {channel}: amplitude unit → {unit}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+            c["ampl_label"].config(text=_AMPL_LABEL[unit])
+            self._notify(f"Channel {channel}: amplitude unit → {unit}")
+
+        if self._shadow.get((channel, "ampl_unit")) == unit:
+            c["ampl_label"].config(text=_AMPL_LABEL[unit])
+            return
+        self._submit(gen.set_amplitude_unit, channel, unit, on_ok=done)
 
     def update_frequency_unit(self, channel):
         """Update frequency unit and label"""
+        c = self.ch[channel]
         try:
-            unit = getattr(self, f"ch{channel}_freq_unit").get()
+            unit = c["freq_unit"].get()
 
             # Update label
-            label = getattr(self, f"ch{channel}_freq_label")
-            if unit == "HZ":
-                label.config(text="Frequency (Hz):")
-            elif unit == "KHZ":
-                label.config(text="Frequency (kHz):")
-            elif unit == "MHZ":
-                label.config(text="Frequency (MHz):")
-
-            messagebox.showinfo("OK", f"Channel {channel}: frequency unit → {unit}")
+            c["freq_label"].config(text=_FREQ_LABEL[unit])
+
+            self._notify(f"Channel {channel}: frequency unit → {unit}")
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
-    def set_rf_mode(self, channel):
+    @_needs_connection
+    def set_rf_mode(self, gen, channel):
         """Quick configuration for RF measurements (50Ω + dBm)"""
-        if not self.check_connection():
-            return
+        c = self.ch[channel]
+        self._invalidate_status(channel)
 
-        try:
-            # Set 50Ω load and dBm unit
-            self.gen.set_50ohm_dbm_mode(channel)
+        def done(_):
+            self._shadow[(channel, "ampl_unit")] = "DBM"
+            self._shadow.pop((channel, "ampl"), None)
 
             # Update GUI controls
-            getattr(self, f"ch{channel}_load").set("50")
-            getattr(self, f"ch{channel}_ampl_unit").set("DBM")
+            c["load"].set("50")
+            c["ampl_unit"].set("DBM")
 
             # Update amplitude label
-            label = getattr(self, f"ch{channel}_ampl_label")
-            label.config(text="Power (dBm):")
+            c["ampl_label"].config(text=_AMPL_LABEL["DBM"])
 
-            messagebox.showinfo("OK", f"Channel {channel}: configured for RF (50Ω + dBm)")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+            self._notify(f"Channel {channel}: configured for RF (50Ω + dBm)")
+
+        # Set 50Ω load and dBm unit
+        self._submit(gen.set_50ohm_dbm_mode, channel, on_ok=done)
 
     # === MODULATION METHODS ===
 
-    def set_am_modulation(self, channel):
+    @_needs_connection
+    def set_am_modulation(self, gen, channel):
         """Enable AM modulation"""
-        if not self.check_connection():
-            return
+        c = self.ch[channel]
+        self._invalidate_status(channel)
 
-        try:
-            depth = float(getattr(self, f"ch{channel}_am_depth").get())
-            freq = float(getattr(self, f"ch{channel}_am_freq").get())
-            self.gen.set_am_modulation(channel, depth, freq)
-            messagebox.showinfo("OK", f"Channel {channel}: AM enabled (depth={depth}%, freq={freq}Hz)")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        depth = _parse_num(c["am_depth"].get())
+        freq = _parse_num(c["am_freq"].get(), suffix=True)
+        self._submit(gen.set_am_modulation, channel, depth, freq, on_ok=lambda _:
+                     self._notify(f"Channel {channel}: AM enabled (depth={depth}%, freq={freq}Hz)"))
 
-    def set_fm_modulation(self, channel):
+    @_needs_connection
+    def set_fm_modulation(self, gen, channel):
         """Enable FM modulation"""
-        if not self.check_connection():
-            return
+        c = self.ch[channel]
+        self._invalidate_status(channel)
 
-        try:
-            dev = float(getattr(self, f"ch{channel}_fm_dev").get())
-            freq = float(getattr(self, f"ch{channel}_fm_freq").get())
-            self.gen.set_fm_modulation(channel, dev, freq)
-            messagebox.showinfo("OK", f"Channel {channel}: FM enabled (dev={dev}Hz, freq={freq}Hz)")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        dev = _parse_num(c["fm_dev"].get(), suffix=True)
+        freq = _parse_num(c["fm_freq"].get(), suffix=True)
+        self._submit(gen.set_fm_modulation, channel, dev, freq, on_ok=lambda _:
+                     self._notify(f"Channel {channel}: FM enabled (dev={dev}Hz, freq={freq}Hz)"))
 
-    def modulation_off(self, channel):
+    @_needs_connection
+    def modulation_off(self, gen, channel):
         """Disable modulation"""
-        if not self.check_connection():
-            return
+        self._invalidate_status(channel)
 
-        try:
-            self.gen.modulation_off(channel)
-            messagebox.showinfo("OK", f"Channel {channel}: modulation disabled")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self._submit(gen.modulation_off, channel, on_ok=lambda _:
+                     self._notify(f"Channel {channel}: modulation disabled"))
 
     # === OUTPUT METHODS ===
 
-    def set_output_load(self, channel):
+    @_needs_connection
+    def set_output_load(self, gen, channel):
         """Set load impedance"""
-        if not self.check_connection():
-            return
+        self._invalidate_status(channel)
 
-        try:
-            load = getattr(self, f"ch{channel}_load").get()
-            self.gen.set_output_load(channel, load)
-            messagebox.showinfo("OK", f"Channel {channel}: load → {load} Ω")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        load = self.ch[channel]["load"].get()
+        self._apply_param((channel, "load"), load, gen.set_output_load, channel, load,
+                          msg=f"Channel {channel}: load → {load} Ω")
 
-    def output_on(self, channel):
+    @_needs_connection
+    def output_on(self, gen, channel):
         """Enable output"""
-        if not self.check_connection():
-            return
+        self._invalidate_status(channel)
 
-        try:
-            self.gen.output_on(channel)
-            messagebox.showinfo("OK", f"Channel {channel}: OUTPUT ON")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self._submit(gen.output_on, channel, on_ok=lambda _:
+                     self._notify(f"Channel {channel}: OUTPUT ON"))
 
-    def output_off(self, channel):
+    @_needs_connection
+    def output_off(self, gen, channel):
         """Disable output"""
-        if not self.check_connection():
-            return
+        self._invalidate_status(channel)
 
-        try:
-            self.gen.output_off(channel)
-            messagebox.showinfo("OK", f"Channel {channel}: OUTPUT OFF")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self._submit(gen.output_off, channel, on_ok=lambda _:
+                     self._notify(f"Channel {channel}: OUTPUT OFF"))
 
-    def read_status(self, channel):
+    @_needs_connection
+    def read_status(self, gen, channel):
         """Read current channel status"""
-        if not self.check_connection():
+        self._submit(self._query_status, gen, channel,
+                     on_ok=partial(self._show_status, channel, seq=self._shadow_seq))
+
+    def _query_status(self, gen, channel):
+        """Query the status values shown by read_status (VISA worker thread)"""
+        # Short-lived cache so repeated clicks don't re-query the instrument
+        return self._cached_query((channel, "state"),
+                                  partial(gen.get_channel_state, channel))
+
+    def _toggle_status_poll(self, channel):
+        """Start or stop the status auto-refresh of a channel"""
+        job = self._status_jobs.pop(channel, None)
+        if job is not None:
+            self.root.after_cancel(job)
+        # A query in flight reschedules the chain itself when it finishes
+        if self.ch[channel]["auto_status"].get() and channel not in self._status_inflight:
+            self._poll_status(channel)
+
+    def _schedule_status_poll(self, channel, delay=_STATUS_POLL_MS):
+        """Queue the next status auto-refresh of a channel"""
+        if self.ch[channel]["auto_status"].get():
+            delay += random.randint(0, _STATUS_POLL_JITTER_MS)
+            self._status_jobs[channel] = self.root.after(
+                delay, self._poll_status, channel)
+
+    def _poll_status(self, channel):
+        """
+        Query the channel status in the background and schedule the next poll
+
+        Polls only while the channel tab is shown and a generator is
+        connected; the next one is scheduled once the query has finished,
+        so slow replies never pile up in the command queue.
+        """
+        self._status_jobs.pop(channel, None)
+        gen = self._current_gen()
+        frame = self.channel1_frame if channel == 1 else self.channel2_frame
+        if (gen is None or self.root.state() == "iconic"
+                or self.notebook.select() != str(frame)):
+            self._schedule_status_poll(channel, 1000)
             return
 
+        seq = self._shadow_seq
+
+        def done(values):
+            self._status_inflight.discard(channel)
+            # Status pane only: controls the user may be editing stay as typed
+            self._show_status(channel, values, sync=False, seq=seq)
+            self._schedule_status_poll(channel)
+
+        def failed(e):
+            self._status_inflight.discard(channel)
+            self.ch[channel]["auto_status"].set(False)
+            self._notify(f"Channel {channel}: status auto-refresh stopped ({e})")
+
+        self._status_inflight.add(channel)
+        self._submit(self._query_status, gen, channel, on_ok=done, on_err=failed)
+
+    def _show_status(self, channel, values, sync=True, seq=None):
+        """
+        Show queried status values and, if sync, update the channel controls
+
+        seq is _shadow_seq when the query was queued; if a write has been
+        requested since, the values read may predate it and are not used
+        as the shadow.
+        """
+        c = self.ch[channel]
+        func, freq_hz, ampl, ampl_unit, is_on = values
+        freq_hz = float(freq_hz)
+
+        # Later setters can skip values the generator already has
+        if seq == self._shadow_seq:
+            self._shadow[(channel, "freq")] = freq_hz
+            self._shadow[(channel, "ampl")] = (float(ampl), ampl_unit)
+            self._shadow[(channel, "ampl_unit")] = ampl_unit
+
+        # Format frequency in the most appropriate unit
+        freq_display = _format_freq(freq_hz)
+        best_value, best_unit = _scale_freq(freq_hz)
+
+        # Format amplitude unit
+        unit_str = _UNIT_DISPLAY.get(ampl_unit, ampl_unit)
+
+        c["status"].configure(text=
+            f"=== CHANNEL {channel} ===\n\n"
+            f"Waveform: {func}\n"
+            f"Frequency: {freq_display}\n"
+            f"Amplitude: {ampl} {unit_str}\n"
+            f"Output: {'ON' if is_on else 'OFF'}")
+
+        if not sync:
+            return
+
+        # Also update GUI controls with read values (not an edit to auto-apply)
+        self._syncing = True
         try:
-            func = self.gen.get_function(channel)
-            freq_hz = float(self.gen.get_frequency(channel))
-            ampl = self.gen.get_amplitude(channel)
-            ampl_unit = self.gen.get_amplitude_unit(channel)
-            is_on = self.gen.is_output_on(channel)
-
-            # Format frequency in the most appropriate unit
-            if freq_hz >= 1000000:
-                freq_display = f"{freq_hz/1000000:.3f} MHz"
-                best_unit = "MHZ"
-                best_value = freq_hz/1000000
-            elif freq_hz >= 1000:
-                freq_display = f"{freq_hz/1000:.3f} kHz"
-                best_unit = "KHZ"
-                best_value = freq_hz/1000
-            else:
-                freq_display = f"{freq_hz:.1f} Hz"
-                best_unit = "HZ"
-                best_value = freq_hz
-
-            status_text = getattr(self, f"ch{channel}_status")
-            status_text.delete(1.0, tk.END)
-            status_text.insert(tk.END, f"=== CHANNEL {channel} ===\n\n")
-            status_text.insert(tk.END, f"Waveform: {func}\n")
-            status_text.insert(tk.END, f"Frequency: {freq_display}\n")
-
-            # Format amplitude unit
-            unit_str = {"VPP": "Vpp", "VRMS": "Vrms", "DBM": "dBm"}.get(ampl_unit, ampl_unit)
-            status_text.insert(tk.END, f"Amplitude: {ampl} {unit_str}\n")
-            status_text.insert(tk.END, f"Output: {'ON' if is_on else 'OFF'}\n")
-
-            # Also update GUI controls with read values
-            getattr(self, f"ch{channel}_ampl_unit").set(ampl_unit)
-            getattr(self, f"ch{channel}_freq_unit").set(best_unit)
-            getattr(self, f"ch{channel}_freq").set(f"{best_value:.3f}" if best_unit != "HZ" else f"{best_value:.1f}")
-
-            # Update labels
-            ampl_label = getattr(self, f"ch{channel}_ampl_label")
-            if ampl_unit == "VPP":
-                ampl_label.config(text="Amplitude (Vpp):")
-            elif ampl_unit == "VRMS":
-                ampl_label.config(text="Amplitude (Vrms):")
-            elif ampl_unit == "DBM":
-                ampl_label.config(text="Power (dBm):")
-
-            freq_label = getattr(self, f"ch{channel}_freq_label")
-            if best_unit == "HZ":
-                freq_label.config(text="Frequency (Hz):")
-            elif best_unit == "KHZ":
-                freq_label.config(text="Frequency (kHz):")
-            elif best_unit == "MHZ":
-                freq_label.config(text="Frequency (MHz):")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+            c["ampl_unit"].set(ampl_unit)
+            c["freq_unit"].set(best_unit)
+            c["freq"].set(f"{best_value:.{_FREQ_DECIMALS[best_unit]}f}")
+        finally:
+            self._syncing = False
+
+        # Update labels (one configure call per widget)
+        if ampl_unit in _AMPL_LABEL:
+            c["ampl_label"].configure(text=_AMPL_LABEL[ampl_unit])
+        c["freq_label"].configure(text=_FREQ_LABEL[best_unit])
 
     # === ARBITRARY WAVEFORM METHODS ===
 
-    def load_csv(self):
+    def _show_sample_rate(self, rate):
+        """Show a sample rate in Sa/s in the ARB rate entry with a fitting unit"""
+        value, unit = _scale_freq(rate)
+        self.arb_srate.set(f"{value:.0f}" if unit == "HZ" else f"{value:.3f}")
+        self.arb_srate_unit.set(unit)
+
+    @_needs_connection
+    def load_csv(self, gen):
         """Load waveform from CSV"""
-        if not self.check_connection():
-            return
+        self._invalidate_status()
 
         filename = filedialog.askopenfilename(
             title="Select CSV file",
@@ -1052,36 +1926,37 @@ class RigolDGGUI:
 
         self.csv_path_label.config(text=f"File: {filename}")
 
-        try:
-            channel = int(self.arb_channel.get())
-            name = self.arb_name.get()
-            normalize = self.arb_normalize.get()
-
-            num_points = self.gen.load_arb_from_csv(channel, filename, name, normalize)
-
-            # Note: waveform is automatically activated by create_arb_waveform
-
-            self.arb_info.delete(1.0, tk.END)
-            self.arb_info.insert(tk.END, f"File loaded: {filename}\n")
-            self.arb_info.insert(tk.END, f"Points loaded: {num_points}\n")
-            self.arb_info.insert(tk.END, f"Name: {name}\n")
-            self.arb_info.insert(tk.END, f"Normalized: {'Yes' if normalize else 'No'}\n")
-            self.arb_info.insert(tk.END, f"Channel: {channel}\n")
-            self.arb_info.insert(tk.END, f"\n✓ Waveform saved to instrument memory!\n")
-            self.arb_info.insert(tk.END, f"\nTo use it:\n")
-            self.arb_info.insert(tk.END, f"1. On the generator, press 'Waveforms' button\n")
-            self.arb_info.insert(tk.END, f"2. Select 'Arb' category\n")
-            self.arb_info.insert(tk.END, f"3. Choose '{name}' from the list\n")
-            self.arb_info.insert(tk.END, f"4. Enable output on Channel {channel}")
-
-            messagebox.showinfo("OK", f"Loaded and activated {num_points} points on channel {channel}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-
-    def load_wav(self):
+        channel = int(self.arb_channel.get())
+        self._last_arb.pop(channel, None)
+        name = self.arb_name.get()
+        normalize = self.arb_normalize.get()
+
+        # Note: waveform is automatically activated by create_arb_waveform
+
+        def done(num_points):
+            _set_text(self.arb_info,
+                f"File loaded: {filename}\n"
+                f"Points loaded: {num_points}\n"
+                f"Name: {name}\n"
+                f"Normalized: {'Yes' if normalize else 'No'}\n"
+                f"Channel: {channel}\n"
+                f"\n✓ Waveform saved to instrument memory!\n"
+                f"\nTo use it:\n"
+                f"1. On the generator, press 'Waveforms' button\n"
+                f"2. Select 'Arb' category\n"
+                f"3. Choose '{name}' from the list\n"
+                f"4. Enable output on Channel {channel}")
+
+            self._notify(f"Loaded and activated {num_points} points on channel {channel}")
+
+        # CSV parsing and upload both run on the VISA worker
+        self._submit(gen.load_arb_from_csv, channel, filename, name, normalize,
+                     on_ok=done)
+
+    @_needs_connection
+    def load_wav(self, gen):
         """Load waveform from WAV file"""
-        if not self.check_connection():
-            return
+        self._invalidate_status()
 
         filename = filedialog.askopenfilename(
             title="Select WAV file",
@@ -1093,386 +1968,470 @@ class RigolDGGUI:
 
         self.wav_path_label.config(text=f"File: {filename}")
 
-        try:
-            import tempfile
-            import os
-
-            channel = int(self.arb_channel.get())
-            name = self.arb_name.get()
-            max_points = int(self.wav_max_points.get())
-            wav_channel = int(self.wav_channel.get().split()[0])  # Extract number from "0 (Left/Mono)"
+        channel = int(self.arb_channel.get())
+        self._last_arb.pop(channel, None)
+        name = self.arb_name.get()
+        max_points = _parse_count(self.wav_max_points.get())
+        wav_channel = int(self.wav_channel.get().split()[0])  # Extract number from "0 (Left/Mono)"
 
-            # Convert WAV to temporary CSV
-            temp_csv = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-            temp_csv.close()
+        def work():
+            # Decode WAV straight into an array (no intermediate CSV)
+            data, info = wav_to_array(filename, max_points=max_points,
+                                      channel=wav_channel, normalize=True)
 
-            # Convert WAV to CSV
-            info = wav_to_csv(filename, temp_csv.name, max_points=max_points,
-                            channel=wav_channel, normalize=True)
-
-            # Load CSV into generator
-            num_points = self.gen.load_arb_from_csv(channel, temp_csv.name, name, normalize=False)
+            # Load samples into generator
+            num_points = gen.load_arb_from_array(channel, data, name, normalize=False)
 
             # Set suggested sample rate
-            suggested_rate = info['suggested_sample_rate']
-            self.gen.set_arb_sample_rate(channel, suggested_rate)
+            gen.set_arb_sample_rate(channel, info['suggested_sample_rate'])
+            return num_points, info
 
-            # Update UI with appropriate unit
-            if suggested_rate >= 1000000:
-                self.arb_srate.set(f"{suggested_rate/1000000:.3f}")
-                self.arb_srate_unit.set("MHZ")
-            elif suggested_rate >= 1000:
-                self.arb_srate.set(f"{suggested_rate/1000:.3f}")
-                self.arb_srate_unit.set("KHZ")
-            else:
-                self.arb_srate.set(f"{suggested_rate:.0f}")
-                self.arb_srate_unit.set("HZ")
+        def done(result):
+            num_points, info = result
 
-            # Clean up temp file
-            os.unlink(temp_csv.name)
+            # Update UI with appropriate unit
+            self._show_sample_rate(info['suggested_sample_rate'])
 
             # Note: waveform is automatically activated by create_arb_waveform
 
             # Update info
-            self.arb_info.delete(1.0, tk.END)
-            self.arb_info.insert(tk.END, f"WAV file loaded: {os.path.basename(filename)}\n")
-            self.arb_info.insert(tk.END, f"Original sample rate: {info['sample_rate']} Hz\n")
-            self.arb_info.insert(tk.END, f"Duration: {info['duration']:.3f} seconds\n")
-            self.arb_info.insert(tk.END, f"Channels: {info['channels']}\n")
-            self.arb_info.insert(tk.END, f"Points exported: {info['num_points']}\n")
-            self.arb_info.insert(tk.END, f"Generator sample rate: {info['suggested_sample_rate']:.0f} Sa/s\n")
-            self.arb_info.insert(tk.END, f"Downsampled: {'Yes' if info['downsampled'] else 'No'}\n")
-            self.arb_info.insert(tk.END, f"Name: {name}\n")
-            self.arb_info.insert(tk.END, f"Channel: {channel}\n")
-            self.arb_info.insert(tk.END, f"\n✓ Waveform saved to instrument memory!\n")
-            self.arb_info.insert(tk.END, f"\nTo use it:\n")
-            self.arb_info.insert(tk.END, f"1. On the generator, press 'Waveforms' button\n")
-            self.arb_info.insert(tk.END, f"2. Select 'Arb' category\n")
-            self.arb_info.insert(tk.END, f"3. Choose '{name}' from the list\n")
-            self.arb_info.insert(tk.END, f"4. Enable output on Channel {channel}")
-
-            messagebox.showinfo("OK",
-                f"Loaded and activated {num_points} points on channel {channel}\n"
-                f"Sample rate set to {info['suggested_sample_rate']:.0f} Sa/s")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-
-    def use_native_dualtone(self):
+            _set_text(self.arb_info,
+                f"WAV file loaded: {os.path.basename(filename)}\n"
+                f"Original sample rate: {info['sample_rate']} Hz\n"
+                f"Duration: {info['duration']:.3f} seconds\n"
+                f"Channels: {info['channels']}\n"
+                f"Points exported: {info['num_points']}\n"
+                f"Generator sample rate: {info['suggested_sample_rate']:.0f} Sa/s\n"
+                f"Downsampled: {'Yes' if info['downsampled'] else 'No'}\n"
+                f"Name: {name}\n"
+                f"Channel: {channel}\n"
+                f"\n✓ Waveform saved to instrument memory!\n"
+                f"\nTo use it:\n"
+                f"1. On the generator, press 'Waveforms' button\n"
+                f"2. Select 'Arb' category\n"
+                f"3. Choose '{name}' from the list\n"
+                f"4. Enable output on Channel {channel}")
+
+            self._notify(f"Loaded and activated {num_points} points on channel {channel}, "
+                         f"sample rate {info['suggested_sample_rate']:.0f} Sa/s")
+
+        self._submit(work, on_ok=done)
+
+    @_needs_connection
+    def use_native_dualtone(self, gen):
         """Use the built-in dual-tone (harmonic) function"""
-        if not self.check_connection():
-            return
-
-        try:
-            channel = int(self.arb_channel.get())
-
-            # Get frequencies with units
-            f1 = float(self.dual_tone_f1.get())
-            f1_unit = self.dual_tone_f1_unit.get()
-            if f1_unit == "KHZ":
-                f1 *= 1000
-            elif f1_unit == "MHZ":
-                f1 *= 1000000
-
-            f2 = float(self.dual_tone_f2.get())
-            f2_unit = self.dual_tone_f2_unit.get()
-            if f2_unit == "KHZ":
-                f2 *= 1000
-            elif f2_unit == "MHZ":
-                f2 *= 1000000
-
-            # Use built-in dual-tone function
-            self.gen.set_dual_tone(channel, f1, f2, amplitude=2.0)
-
-            # Format frequencies for display
-            def format_freq(freq):
-                if freq >= 1000000:
-                    return f"{freq/1000000:.3f} MHz"
-                elif freq >= 1000:
-                    return f"{freq/1000:.3f} kHz"
-                else:
-                    return f"{freq:.1f} Hz"
-
-            self.arb_info.delete(1.0, tk.END)
-            self.arb_info.insert(tk.END, f"✓ Native Dual-Tone Activated!\n\n")
-            self.arb_info.insert(tk.END, f"Channel: {channel}\n")
-            self.arb_info.insert(tk.END, f"Frequency 1: {format_freq(f1)}\n")
-            self.arb_info.insert(tk.END, f"Frequency 2: {format_freq(f2)}\n")
-            self.arb_info.insert(tk.END, f"Amplitude: 2.0 Vpp\n")
-            self.arb_info.insert(tk.END, f"\nThe generator is now using its built-in\n")
-            self.arb_info.insert(tk.END, f"harmonic/dual-tone function.\n")
-            self.arb_info.insert(tk.END, f"\nRemember to enable output on Channel {channel}!")
-
-            messagebox.showinfo("OK", f"Native dual-tone activated on channel {channel}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-
-    def generate_arb(self):
+        self._invalidate_status()
+
+        channel = int(self.arb_channel.get())
+        self._last_arb.pop(channel, None)
+
+        # Get frequencies with units
+        f1 = _read_freq(self.dual_tone_f1, self.dual_tone_f1_unit)
+        f2 = _read_freq(self.dual_tone_f2, self.dual_tone_f2_unit)
+
+        def done(_):
+            _set_text(self.arb_info,
+                f"✓ Native Dual-Tone Activated!\n\n"
+                f"Channel: {channel}\n"
+                f"Frequency 1: {_format_freq(f1)}\n"
+                f"Frequency 2: {_format_freq(f2)}\n"
+                f"Amplitude: 2.0 Vpp\n"
+                f"\nThe generator is now using its built-in\n"
+                f"harmonic/dual-tone function.\n"
+                f"\nRemember to enable output on Channel {channel}!")
+
+            self._notify(f"Native dual-tone activated on channel {channel}")
+
+        # Use built-in dual-tone function
+        self._submit(partial(gen.set_dual_tone, channel, f1, f2, amplitude=2.0),
+                     on_ok=done)
+
+    @_needs_connection
+    def generate_arb(self, gen):
         """Generate mathematical waveform"""
-        if not self.check_connection():
-            return
-
-        try:
-            channel = int(self.arb_channel.get())
-            name = self.arb_name.get()
-            arb_type = self.arb_type.get()
-            points = int(self.arb_points.get())
-
-            if arb_type == "dual-tone":
-                # Dual-tone: sum of two sinusoids
-                f1 = float(self.dual_tone_f1.get())
-                f1_unit = self.dual_tone_f1_unit.get()
-                if f1_unit == "KHZ":
-                    f1 *= 1000
-                elif f1_unit == "MHZ":
-                    f1 *= 1000000
-
-                f2 = float(self.dual_tone_f2.get())
-                f2_unit = self.dual_tone_f2_unit.get()
-                if f2_unit == "KHZ":
-                    f2 *= 1000
-                elif f2_unit == "MHZ":
-                    f2 *= 1000000
-
-                # Calculate appropriate sample rate (at least 10x highest frequency)
-                max_freq = max(f1, f2)
-                sample_rate = max_freq * 10
-
-                # Generate time vector for 1 period of the beat frequency
-                beat_freq = abs(f2 - f1)
-                if beat_freq > 0:
-                    duration = 1.0 / beat_freq  # One beat period
-                else:
-                    duration = 1.0 / max_freq  # One period of the signal
-
-                # Ensure we have enough points for good resolution
-                sample_rate = max(sample_rate, points / duration)
-
-                # Generate time vector
-                t = np.linspace(0, duration, points, endpoint=False)
-
-                # Generate dual-tone signal
-                data = np.sin(2*np.pi*f1*t) + np.sin(2*np.pi*f2*t)
-
-                # Set sample rate on the generator
-                self.gen.set_arb_sample_rate(channel, sample_rate)
-
-                # Update UI with appropriate unit
-                if sample_rate >= 1000000:
-                    self.arb_srate.set(f"{sample_rate/1000000:.3f}")
-                    self.arb_srate_unit.set("MHZ")
-                elif sample_rate >= 1000:
-                    self.arb_srate.set(f"{sample_rate/1000:.3f}")
-                    self.arb_srate_unit.set("KHZ")
-                else:
-                    self.arb_srate.set(f"{sample_rate:.0f}")
-                    self.arb_srate_unit.set("HZ")
-
-                # Format frequencies for display
-                def format_freq(freq):
-                    if freq >= 1000000:
-                        return f"{freq/1000000:.3f} MHz"
-                    elif freq >= 1000:
-                        return f"{freq/1000:.3f} kHz"
-                    else:
-                        return f"{freq:.1f} Hz"
-
-                info_text = f"Waveform generated: dual-tone\n"
-                info_text += f"Freq1: {format_freq(f1)}\n"
-                info_text += f"Freq2: {format_freq(f2)}\n"
-                info_text += f"Beat freq: {beat_freq} Hz\n"
-                info_text += f"Points: {points}\n"
-                info_text += f"Sample rate: {sample_rate:.0f} Sa/s\n"
-                info_text += f"Duration: {duration*1000:.3f} ms\n"
-                info_text += f"Name: {name}\n"
+        self._invalidate_status()
+
+        channel = int(self.arb_channel.get())
+        uploaded = self._last_arb.get(channel)
+        name = self.arb_name.get()
+        arb_type = self.arb_type.get()
+        points = _parse_count(self.arb_points.get())
+        sample_rate = None  # Left unchanged unless set below
+
+        if arb_type == "dual-tone":
+            # Dual-tone: sum of two sinusoids
+            f1 = _read_freq(self.dual_tone_f1, self.dual_tone_f1_unit)
+            f2 = _read_freq(self.dual_tone_f2, self.dual_tone_f2_unit)
+
+            # Calculate appropriate sample rate (at least 10x highest frequency)
+            max_freq = max(f1, f2)
+            sample_rate = max_freq * 10
+
+            # Generate time vector for 1 period of the beat frequency
+            beat_freq = abs(f2 - f1)
+            if beat_freq > 0:
+                duration = 1.0 / beat_freq  # One beat period
             else:
-                # Generate data for other waveforms
-                t = np.linspace(-np.pi, np.pi, points)
-
-                if arb_type == "sinc":
-                    data = np.sinc(t)
-                elif arb_type == "gauss":
-                    data = np.exp(-t**2 / 2)
-                elif arb_type == "exponential":
-                    data = np.exp(-abs(t))
-                elif arb_type == "chirp":
-                    data = np.sin(t**2)
-                else:
-                    raise ValueError(f"Unknown type: {arb_type}")
+                duration = 1.0 / max_freq  # One period of the signal
+
+            # Ensure we have enough points for good resolution
+            sample_rate = max(sample_rate, points / duration)
+
+            # Generate time vector
+            t = np.linspace(0, duration, points, endpoint=False)
+
+            # Generate dual-tone signal. The phase is computed in float64:
+            # over many cycles float32 phase error exceeds the 14-bit DAC step.
+            # Work in place on t (not needed afterwards) and one extra buffer
+            w = t
+            w *= 2*np.pi
+            tone = w * f1
+            np.sin(tone, out=tone)
+            w *= f2
+            np.sin(w, out=w)
+            tone += w
+            data = tone.astype(np.float32)
+
+            info_text = (
+                f"Waveform generated: dual-tone\n"
+                f"Freq1: {_format_freq(f1)}\n"
+                f"Freq2: {_format_freq(f2)}\n"
+                f"Beat freq: {beat_freq} Hz\n"
+                f"Points: {points}\n"
+                f"Sample rate: {sample_rate:.0f} Sa/s\n"
+                f"Duration: {duration*1000:.3f} ms\n"
+                f"Name: {name}\n")
+        else:
+            # Generate data for other waveforms (float32 is ample for a
+            # 14-bit DAC and halves the work on large point counts)
+            shape = _ARB_SHAPES.get(arb_type)
+            if shape is None:
+                raise ValueError(f"Unknown type: {arb_type}")
+            data = np.empty(points, dtype=np.float32)
+            shape(_t_grid(points), data)
+
+            info_text = (
+                f"Waveform generated: {arb_type}\n"
+                f"Points: {points}\n"
+                f"Name: {name}\n")
+
+        # Normalize in place; the peak comes from two reductions with
+        # no |data| temporary
+        data /= max(data.max(), -data.min())
+
+        # The same samples are still in volatile memory: reselect them
+        # instead of transferring them again. Equal samples always give
+        # equal DAC codes; samples that differ only below one DAC step
+        # are simply sent again
+        digest = hashlib.blake2b(data.tobytes(), digest_size=16).digest()
+        resend = digest != uploaded
+        queued = object()  # Recorded as the digest only if nothing else intervenes
+        self._last_arb[channel] = queued
+
+        def work():
+            # Set sample rate on the generator
+            if sample_rate is not None:
+                gen.set_arb_sample_rate(channel, sample_rate)
+            if resend:
+                gen.create_arb_waveform(channel, data, name)
+            else:
+                gen.set_function(channel, "ARB")
 
-                info_text = f"Waveform generated: {arb_type}\n"
-                info_text += f"Points: {points}\n"
-                info_text += f"Name: {name}\n"
+        def failed(e):
+            if self._last_arb.get(channel) is queued:
+                del self._last_arb[channel]
+            self._show_error(e)
 
-            # Normalize
-            data = data / np.max(np.abs(data))
+        def done(_):
+            if self._last_arb.get(channel) is queued:
+                self._last_arb[channel] = digest
 
-            self.gen.create_arb_waveform(channel, data.tolist(), name)
+            # Update UI with appropriate unit
+            if sample_rate is not None:
+                self._show_sample_rate(sample_rate)
 
             # Note: waveform is automatically activated by create_arb_waveform
 
-            self.arb_info.delete(1.0, tk.END)
-            self.arb_info.insert(tk.END, info_text)
-            self.arb_info.insert(tk.END, f"Channel: {channel}\n")
-            self.arb_info.insert(tk.END, f"\n✓ Waveform saved to instrument memory!\n")
-            self.arb_info.insert(tk.END, f"\nTo use it:\n")
-            self.arb_info.insert(tk.END, f"1. On the generator, press 'Waveforms' button\n")
-            self.arb_info.insert(tk.END, f"2. Select 'Arb' category\n")
-            self.arb_info.insert(tk.END, f"3. Choose '{name}' from the list\n")
-            self.arb_info.insert(tk.END, f"4. Enable output on Channel {channel}")
-
-            messagebox.showinfo("OK", f"Waveform '{arb_type}' generated and activated on channel {channel}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+            _set_text(self.arb_info,
+                info_text +
+                f"Channel: {channel}\n"
+                f"\n✓ Waveform saved to instrument memory!\n"
+                f"\nTo use it:\n"
+                f"1. On the generator, press 'Waveforms' button\n"
+                f"2. Select 'Arb' category\n"
+                f"3. Choose '{name}' from the list\n"
+                f"4. Enable output on Channel {channel}")
 
-    def set_sample_rate(self):
-        """Set sample rate"""
-        if not self.check_connection():
-            return
+            self._notify(f"Waveform '{arb_type}' generated and activated on channel {channel}"
+                         + ("" if resend else " (unchanged, not re-sent)"))
 
-        try:
-            channel = int(self.arb_channel.get())
-            rate = float(eval(self.arb_srate.get()))  # Allows scientific notation
-            rate_unit = self.arb_srate_unit.get()
-
-            # Convert to Hz
-            if rate_unit == "KHZ":
-                rate *= 1000
-            elif rate_unit == "MHZ":
-                rate *= 1000000
-
-            self.gen.set_arb_sample_rate(channel, rate)
-
-            # Format display
-            unit_str = {"HZ": "Hz", "KHZ": "kHz", "MHZ": "MHz"}[rate_unit]
-            rate_display = float(self.arb_srate.get())
-            messagebox.showinfo("OK", f"Sample rate → {rate_display} {unit_str} ({rate} Sa/s)")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self._submit(work, on_ok=done, on_err=failed)
 
-    def list_arb_waveforms(self):
-        """List saved waveforms"""
-        if not self.check_connection():
-            return
+    @_needs_connection
+    def set_sample_rate(self, gen):
+        """Set sample rate"""
+        self._invalidate_status()
 
-        try:
-            waveforms = self.gen.get_arb_list()
+        channel = int(self.arb_channel.get())
+        rate_display = _parse_num(self.arb_srate.get())  # Accepts scientific notation
+        rate_unit = self.arb_srate_unit.get()
+
+        # Convert to Hz
+        rate = rate_display * _FREQ_SCALE[rate_unit]
 
-            self.arb_info.delete(1.0, tk.END)
-            self.arb_info.insert(tk.END, "=== SAVED WAVEFORMS ===\n\n")
+        # Format display
+        unit_str = _FREQ_DISPLAY[rate_unit]
+        self._submit(gen.set_arb_sample_rate, channel, rate, on_ok=lambda _:
+                     self._notify(f"Sample rate → {rate_display} {unit_str} ({rate} Sa/s)"))
 
+    @_needs_connection
+    def list_arb_waveforms(self, gen):
+        """List saved waveforms"""
+        def done(waveforms):
             if waveforms:
-                for wf in waveforms:
-                    self.arb_info.insert(tk.END, f"- {wf}\n")
+                body = "".join(f"- {wf}\n" for wf in waveforms)
             else:
-                self.arb_info.insert(tk.END, "No saved waveforms\n")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+                body = "No saved waveforms\n"
+
+            _set_text(self.arb_info, "=== SAVED WAVEFORMS ===\n\n" + body)
 
-    def load_arb(self):
+        self._submit(gen.get_arb_list, on_ok=done)
+
+    @_needs_connection
+    def load_arb(self, gen):
         """Load ARB waveform"""
-        if not self.check_connection():
-            return
+        self._invalidate_status()
 
-        try:
-            channel = int(self.arb_channel.get())
-            name = self.arb_load_name.get()
+        channel = int(self.arb_channel.get())
+        self._last_arb.pop(channel, None)
+        name = self.arb_load_name.get()
 
-            if not name:
-                messagebox.showwarning("Warning", "Enter waveform name")
-                return
+        if not name:
+            messagebox.showwarning("Warning", "Enter waveform name")
+            return
 
-            self.gen.load_arb_waveform(channel, name)
-            messagebox.showinfo("OK", f"Channel {channel}: loaded waveform '{name}'")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self._submit(gen.load_arb_waveform, channel, name, on_ok=lambda _:
+                     self._notify(f"Channel {channel}: loaded waveform '{name}'"))
 
-    def delete_arb(self):
+    @_needs_connection
+    def delete_arb(self, gen):
         """Delete waveform"""
-        if not self.check_connection():
+        name = self.arb_del_name.get()
+
+        if not name:
+            messagebox.showwarning("Warning", "Enter waveform name")
             return
 
-        try:
-            name = self.arb_del_name.get()
+        # First click arms the button; a second click on the same name
+        # within 3 seconds performs the delete
+        if self._del_pending != name:
+            self._reset_delete_confirm()
+            self._del_pending = name
+            self.arb_del_btn.config(text="Click again to delete", style="Confirm.TButton")
+            self._del_reset_job = self.root.after(3000, self._reset_delete_confirm)
+            return
 
-            if not name:
-                messagebox.showwarning("Warning", "Enter waveform name")
-                return
+        self._reset_delete_confirm()
+        self._submit(gen.delete_arb_waveform, name, on_ok=lambda _:
+                     self._notify(f"Waveform '{name}' deleted"))
 
-            if messagebox.askyesno("Confirm", f"Delete '{name}'?"):
-                self.gen.delete_arb_waveform(name)
-                messagebox.showinfo("OK", f"Waveform '{name}' deleted")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+    def _reset_delete_confirm(self):
+        """Disarm the Delete button"""
+        if self._del_reset_job is not None:
+            self.root.after_cancel(self._del_reset_job)
+            self._del_reset_job = None
+        self._del_pending = None
+        self.arb_del_btn.config(text="Delete", style="TButton")
 
     # === DEBUG METHODS ===
 
     def refresh_debug_log(self):
-        """Refresh debug log from generator"""
+        """
+        Append debug log entries queued by the generator since the last refresh
+
+        Returns:
+            int: Number of entries added to the widget
+        """
         if not self.connected or self.gen is None:
-            self.debug_text.delete(1.0, tk.END)
-            self.debug_text.insert(tk.END, "Not connected. Enable 'Debug Mode' before connecting.\n")
-            return
+            self._show_log_message("Not connected. Enable 'Debug Mode' before connecting.\n")
+            return 0
 
         if not self.gen.debug:
-            self.debug_text.delete(1.0, tk.END)
-            self.debug_text.insert(tk.END, "Debug mode is not enabled.\n")
-            self.debug_text.insert(tk.END, "Disconnect and reconnect with 'Debug Mode' enabled.\n")
-            return
-
+            self._show_log_message(
+                "Debug mode is not enabled.\n"
+                "Disconnect and reconnect with 'Debug Mode' enabled.\n")
+            return 0
+
+        # Entries are pushed by the generator (from any thread) into a
+        # bounded deque; only the Tk thread pops them and touches the widget
+        new_entries = []
         try:
-            log_entries = self.gen.get_debug_log()
-            self.debug_text.delete(1.0, tk.END)
+            while True:
+                new_entries.append(self._log_q.popleft())
+        except IndexError:
+            pass
 
-            if not log_entries:
-                self.debug_text.insert(tk.END, "No debug messages yet.\n")
-            else:
-                for entry in log_entries:
-                    # Color code errors
-                    if "ERROR" in entry:
-                        self.debug_text.insert(tk.END, entry + "\n", "error")
-                    elif "TX:" in entry:
-                        self.debug_text.insert(tk.END, entry + "\n", "tx")
-                    elif "RX:" in entry:
-                        self.debug_text.insert(tk.END, entry + "\n", "rx")
-                    else:
-                        self.debug_text.insert(tk.END, entry + "\n")
-
-            # Configure tags for colors
-            self.debug_text.tag_config("error", foreground="red")
-            self.debug_text.tag_config("tx", foreground="blue")
-            self.debug_text.tag_config("rx", foreground="green")
-
-            # Auto-scroll to bottom
-            self.debug_text.see(tk.END)
+        if not new_entries:
+            if self._log_view != "lines":
+                self._show_log_message("No debug messages yet.\n")
+            return 0
+
+        self.debug_text.configure(state="normal")
+        try:
+            # Follow the end of the log unless the user has scrolled up
+            follow = self.debug_text.yview()[1] >= 1.0
+
+            # Replace a placeholder/message with the log itself
+            if self._log_view != "lines":
+                self.debug_text.delete(1.0, tk.END)
+                self._log_view = "lines"
+                follow = True
+
+            # One insert for all new entries: consecutive lines with the
+            # same colour tag are joined into a single (text, tag) pair
+            args = []
+            run_tag = None
+            run = []
+            for entry in new_entries:
+                tag = _log_tag(entry)
+                if tag != run_tag and run:
+                    args += ["".join(run), run_tag]
+                    run = []
+                run_tag = tag
+                run.append(entry + "\n")
+            args += ["".join(run), run_tag]
+            self.debug_text.insert(tk.END, *args)
+
+            # Keep only the most recent lines so inserts stay cheap
+            lines = int(self.debug_text.index("end-1c").split(".")[0])
+            if lines > _MAX_LOG_LINES:
+                self.debug_text.delete("1.0", f"{lines - _MAX_LOG_LINES}.0")
+
+            # Auto-scroll to bottom once per idle cycle
+            if follow and not self._see_pending:
+                self._see_pending = True
+                self.root.after_idle(self._scroll_log_to_end)
         except Exception as e:
-            self.debug_text.delete(1.0, tk.END)
-            self.debug_text.insert(tk.END, f"Error refreshing log: {str(e)}\n")
+            # Report at the tail; wiping the widget would cost O(lines)
+            self.debug_text.insert(tk.END, f"[refresh error] {e}\n", "error")
+        finally:
+            self.debug_text.configure(state="disabled")
+        return len(new_entries)
+
+    def _scroll_log_to_end(self):
+        """Scroll the debug log to its last line (idle callback)"""
+        self._see_pending = False
+        self.debug_text.see(tk.END)
+
+    def _show_log_message(self, msg):
+        """Replace the debug log widget contents with a message"""
+        if self._log_view == msg:
+            return
+        self._log_view = msg
+        self.debug_text.configure(state="normal")
+        self.debug_text.replace("1.0", tk.END, msg)
+        self.debug_text.configure(state="disabled")
 
     def clear_debug_log(self):
         """Clear debug log"""
         if self.connected and self.gen is not None and self.gen.debug:
             self.gen.clear_debug_log()
-        self.debug_text.delete(1.0, tk.END)
-        self.debug_text.insert(tk.END, "Log cleared.\n")
+        self._log_q.clear()
+        self._show_log_message("Log cleared.\n")
+
+    def _on_debug_entry(self, entry):
+        """
+        Generator debug hook: queue the entry and wake the Tk thread
+
+        May run on any thread. Notifications arriving before the event loop
+        gets to the drain are coalesced into a single drain.
+        """
+        if self._closing:
+            return
+        self._log_q.append(entry)
+        if not self._drain_pending:
+            self._drain_pending = True
+            self.root.after(0, self._drain_log)
+
+    def _drain_log(self):
+        """Show newly queued debug entries right away (Tk thread)"""
+        self._drain_pending = False
+        if not self.auto_refresh_active or not self._log_visible():
+            return
+        gen = self.gen
+        if self.connected and gen is not None and gen.debug:
+            self._log_seq = gen.debug_seq
+        self.refresh_debug_log()
+
+    def _log_visible(self):
+        """Return True if the debug tab is selected and the window is not minimized"""
+        return (self.root.state() != "iconic"
+                and self.notebook.select() == str(self.debug_frame))
 
     def toggle_auto_refresh(self):
         """Toggle auto-refresh of debug log"""
         self.auto_refresh_active = not self.auto_refresh_active
 
+        # Drop any queued tick so there is never more than one chain
+        self._cancel_auto_refresh()
+
         if self.auto_refresh_active:
             self.auto_refresh_label.config(text="ON", foreground="green")
             self.auto_refresh_debug()
         else:
             self.auto_refresh_label.config(text="OFF", foreground="red")
-            if self.auto_refresh_job:
-                self.root.after_cancel(self.auto_refresh_job)
-                self.auto_refresh_job = None
+
+    def _cancel_auto_refresh(self):
+        """Cancel the pending auto-refresh timer and idle callback, if any"""
+        if self.auto_refresh_job is not None:
+            self.root.after_cancel(self.auto_refresh_job)
+            self.auto_refresh_job = None
+        if self._refresh_pending:
+            self.root.after_cancel(self._refresh_pending)
+            self._refresh_pending = None
 
     def auto_refresh_debug(self):
-        """Auto-refresh debug log every second"""
-        if self.auto_refresh_active:
-            self.refresh_debug_log()
+        """Schedule a debug log refresh for when the event loop is idle"""
+        self.auto_refresh_job = None
+        if not self.auto_refresh_active or self._refresh_pending:
+            return
+        self._refresh_pending = self.root.after_idle(self._do_auto_refresh)
+
+    def _do_auto_refresh(self):
+        """
+        Run one auto-refresh and schedule the next one
+
+        New entries are normally shown by _drain_log as they arrive; this
+        timer is the fallback that catches anything a wakeup missed.
+        """
+        self._refresh_pending = None
+        if not self.auto_refresh_active:
+            return
+
+        # Nothing to show while the window is minimized or another tab is up;
+        # the log is caught up when the debug tab is selected again
+        if not self._log_visible():
             self.auto_refresh_job = self.root.after(1000, self.auto_refresh_debug)
+            return
+
+        # Nothing logged since the last tick: no queue or widget work at all
+        gen = self.gen
+        seq = gen.debug_seq if self.connected and gen is not None and gen.debug else None
+        if seq is not None and seq == self._log_seq:
+            self.auto_refresh_job = self.root.after(1000, self.auto_refresh_debug)
+            return
+        self._log_seq = seq
+
+        t0 = time.perf_counter()
+        added = self.refresh_debug_log()
+        self._refresh_times.append(time.perf_counter() - t0)
+
+        # Poll faster while new entries are arriving, slower when idle, and
+        # subtract the typical refresh cost so the period stays steady
+        target = 500 if added else 1000
+        cost_ms = 1000 * sum(self._refresh_times) / len(self._refresh_times)
+        delay = int(max(50, target - cost_ms))
+        self.auto_refresh_job = self.root.after(delay, self.auto_refresh_debug)
 
 
 def main():